@@ -18,6 +18,7 @@ import pytest
 
 from app.agent.factory import document_agent
 from app.model.chat import Chat
+from app.service.task import task_locks
 
 pytestmark = pytest.mark.unit
 
@@ -28,8 +29,6 @@ async def test_document_agent_creation(sample_chat_data):
     options = Chat(**sample_chat_data)
 
     # Setup task lock in the registry before calling agent function
-    from app.service.task import task_locks
-
     mock_task_lock = MagicMock()
     task_locks[options.task_id] = mock_task_lock
 
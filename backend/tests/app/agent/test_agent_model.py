@@ -19,6 +19,7 @@ import pytest
 
 from app.agent.agent_model import agent_model
 from app.model.chat import Chat
+from app.service.task import task_locks
 
 pytestmark = pytest.mark.unit
 
@@ -33,8 +34,6 @@ class TestAgentFactoryFunctions:
         system_prompt = "You are a helpful assistant"
 
         # Setup task lock in the registry before calling agent_model
-        from app.service.task import task_locks
-
         mock_task_lock = MagicMock()
         task_locks[options.task_id] = mock_task_lock
 
@@ -70,15 +69,11 @@ class TestAgentIntegration:
 
     def setup_method(self):
         """Clean up before each test."""
-        from app.service.task import task_locks
-
         task_locks.clear()
 
     @pytest.mark.asyncio
     async def test_full_agent_workflow(self, sample_chat_data):
         """Test complete agent creation and usage workflow."""
-        from app.service.task import task_locks
-
         options = Chat(**sample_chat_data)
         api_task_id = options.task_id
 
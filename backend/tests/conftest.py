@@ -13,11 +13,13 @@
 # ========= Copyright 2025-2026 @ Hanggent.AI All Rights Reserved. =========
 
 import asyncio
+import itertools
 import os
 import tempfile
+import uuid
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import DEFAULT, AsyncMock, MagicMock, patch
 
 import pytest
 from dotenv import load_dotenv
@@ -91,6 +93,32 @@ def pytest_collection_modifyitems(
         return
 
 
+# Version 4 UUIDs handed out instead of calling os.urandom per uuid4(); one
+# stream for the whole session so values never repeat across tests
+_UUIDS = (uuid.UUID(int=i, version=4) for i in itertools.count(1))
+
+
+@pytest.fixture
+def deterministic_uuids(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Serve uuid.uuid4() from a deterministic sequence.
+
+    Only calls made through the ``uuid`` module are covered; a module that
+    did ``from uuid import uuid4`` keeps the real function.
+    """
+    monkeypatch.setattr("uuid.uuid4", lambda: next(_UUIDS))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup_camel() -> None:
+    """Import the camel packages once before the first test runs."""
+    import camel.agents  # noqa: F401
+    import camel.messages  # noqa: F401
+    import camel.models  # noqa: F401
+    import camel.responses  # noqa: F401
+    import camel.toolkits  # noqa: F401
+    import camel.types.agents  # noqa: F401
+
+
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
     """Create a temporary directory for test files."""
@@ -144,6 +172,32 @@ def mock_model_backend():
         yield backend
 
 
+# Mock backends shared across tests, keyed by ModelFactory.create arguments
+_model_backend_cache: dict[str, MagicMock] = {}
+
+
+def _cached_model_backend(*args, **kwargs) -> MagicMock:
+    # repr() keeps the key usable when kwargs carry unhashable config dicts
+    key = repr((args, sorted(kwargs.items())))
+    backend = _model_backend_cache.get(key)
+    if backend is None:
+        backend = MagicMock()
+        backend.model_type = "gpt-4"
+        backend.current_model = MagicMock(model_type="gpt-4")
+        _model_backend_cache[key] = backend
+    return backend
+
+
+@pytest.fixture
+def cached_model_factory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Patch ModelFactory.create to reuse one mock backend per arguments."""
+    from camel.models import ModelFactory
+
+    monkeypatch.setattr(
+        ModelFactory, "create", staticmethod(_cached_model_backend)
+    )
+
+
 @pytest.fixture
 def mock_camel_agent():
     """Mock CAMEL agent for testing."""
@@ -295,7 +349,7 @@ def mock_environment_variables():
         yield env_vars
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_chat_data():
     """Sample chat data for testing."""
     return {
@@ -315,6 +369,65 @@ def sample_chat_data():
     }
 
 
+@pytest.fixture(scope="module")
+def chat_options(sample_chat_data):
+    """Chat options built from the sample chat data."""
+    from app.model.chat import Chat
+
+    return Chat(**sample_chat_data)
+
+
+@pytest.fixture
+def isolated_task_locks(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Give the test its own task_locks registry."""
+    import app.service.task as task_service
+
+    locks: dict = {}
+    monkeypatch.setattr(task_service, "task_locks", locks)
+    return locks
+
+
+@pytest.fixture
+def registered_task_lock(chat_options, isolated_task_locks):
+    """Register a mock TaskLock for the chat options' task id."""
+    lock = MagicMock()
+    isolated_task_locks[chat_options.task_id] = lock
+    return lock
+
+
+# Toolkits whose get_can_use_tools is a plain (non-async) call
+_SYNC_TOOLKITS = (
+    "WhatsAppToolkit",
+    "TwitterToolkit",
+    "LinkedInToolkit",
+    "RedditToolkit",
+    "GoogleCalendarToolkit",
+    "HumanToolkit",
+)
+
+
+@pytest.fixture
+def toolkit_patches(mocker) -> dict[str, MagicMock]:
+    """Patch the social/assistant toolkits used by the agent factories.
+
+    Sync toolkits come pre-configured to expose no tools.
+    """
+    prebuilt = {name: MagicMock() for name in _SYNC_TOOLKITS}
+    for toolkit in prebuilt.values():
+        toolkit.get_can_use_tools.return_value = []
+    patched = mocker.patch.multiple(
+        "app.utils.agent",
+        **prebuilt,
+        NotionMCPToolkit=DEFAULT,
+        GoogleGmailMCPToolkit=DEFAULT,
+        TerminalToolkit=DEFAULT,
+        NoteTakingToolkit=DEFAULT,
+        agent_model=DEFAULT,
+        get_toolkits=DEFAULT,
+    )
+    return {**prebuilt, **patched}
+
+
 @pytest.fixture
 def sample_task_content():
     """Sample task content for testing."""
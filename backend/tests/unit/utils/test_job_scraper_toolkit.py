@@ -1,26 +1,44 @@
 import json
 import sys
 import types
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
 from app.utils.toolkit.job_scraper_toolkit import JobScraperToolkit
 
 
-class FakeJobsDf:
-    def __init__(self, records):
-        self._records = records
-        self.empty = len(records) == 0
+def _fake_df(records):
+    """Minimal DataFrame stand-in exposing .empty and .to_dict("records")."""
+    ns = SimpleNamespace(empty=not records)
+    ns.to_dict = lambda orient, _r=records: _r
+    return ns
 
-    def to_dict(self, orient):
-        assert orient == "records"
-        return self._records
+
+@pytest.fixture(scope="session")
+def fake_jobspy_module():
+    """A stand-in jobspy module, built once per session."""
+    mod = types.ModuleType("jobspy")
+    mod.scrape_jobs = MagicMock()
+    return mod
+
+
+@pytest.fixture
+def fake_jobspy(fake_jobspy_module, monkeypatch):
+    """Install the fake jobspy module with a freshly reset scrape_jobs."""
+    fake_jobspy_module.scrape_jobs.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setitem(sys.modules, "jobspy", fake_jobspy_module)
+    return fake_jobspy_module
 
 
 @pytest.mark.unit
 class TestJobScraperToolkit:
-    def test_search_jobs_developer_latest_7_days_vancouver_indeed_linkedin_canada(self, monkeypatch):
+    @pytest.fixture(scope="class", autouse=True)
+    def _stub_hash_loader(self, class_mocker):
+        class_mocker.patch.object(JobScraperToolkit, "_load_existing_hashes_sync", return_value=None)
+
+    def test_search_jobs_developer_latest_7_days_vancouver_indeed_linkedin_canada(self, fake_jobspy):
         records = [
             {
                 "job_url": "https://example.com/job/123",
@@ -31,47 +49,40 @@ class TestJobScraperToolkit:
             }
         ]
 
-        mock_scrape = MagicMock(return_value=FakeJobsDf(records))
-        fake_jobspy = types.ModuleType("jobspy")
-        fake_jobspy.scrape_jobs = mock_scrape
-        monkeypatch.setitem(sys.modules, "jobspy", fake_jobspy)
-
-        with patch.object(JobScraperToolkit, "_load_existing_hashes_sync") as mock_load_hashes:
-            mock_load_hashes.return_value = None
-
-            toolkit = JobScraperToolkit(api_task_id="test_task")
-            toolkit._known_hashes = set()
-            toolkit._hashes_loaded = True
-
-            result = toolkit.search_jobs(
-                search_term="developer",
-                location="Vancouver",
-                site_names=["indeed", "linkedin"],
-                country_indeed="Canada",
-            )
-
-            data = json.loads(result)
-
-            print([job.get("description") for job in data["jobs"]])
-
-            assert data["status"] == "success"
-            assert data["new_jobs"] == 1
-            assert data["total_found"] == 1
-            assert data["search_criteria"]["search_term"] == "developer"
-            assert data["search_criteria"]["location"] == "Vancouver"
-            assert data["search_criteria"]["sites"] == ["indeed", "linkedin"]
-            assert data["search_criteria"]["hours_old"] == 168
-            assert data["search_criteria"]["job_type"] is None
-
-            job = data["jobs"][0]
-            assert job["job_url"] == "https://example.com/job/123"
-            assert "url_hash" in job
-
-            mock_scrape.assert_called_once()
-            _, kwargs = mock_scrape.call_args
-            assert kwargs["site_name"] == ["indeed", "linkedin"]
-            assert kwargs["search_term"] == "developer"
-            assert kwargs["location"] == "Vancouver"
-            assert kwargs["hours_old"] == 168
-            assert kwargs["country_indeed"] == "Canada"
-            assert kwargs["results_wanted"] == 20
+        mock_scrape = fake_jobspy.scrape_jobs
+        mock_scrape.return_value = _fake_df(records)
+
+        toolkit = JobScraperToolkit(api_task_id="test_task")
+        toolkit._known_hashes = set()
+        toolkit._hashes_loaded = True
+
+        result = toolkit.search_jobs(
+            search_term="developer",
+            location="Vancouver",
+            site_names=["indeed", "linkedin"],
+            country_indeed="Canada",
+        )
+
+        data = json.loads(result)
+
+        assert data["status"] == "success"
+        assert data["new_jobs"] == 1
+        assert data["total_found"] == 1
+        assert data["search_criteria"]["search_term"] == "developer"
+        assert data["search_criteria"]["location"] == "Vancouver"
+        assert data["search_criteria"]["sites"] == ["indeed", "linkedin"]
+        assert data["search_criteria"]["hours_old"] == 168
+        assert data["search_criteria"]["job_type"] is None
+
+        job = data["jobs"][0]
+        assert job["job_url"] == "https://example.com/job/123"
+        assert "url_hash" in job
+
+        mock_scrape.assert_called_once()
+        _, kwargs = mock_scrape.call_args
+        assert kwargs["site_name"] == ["indeed", "linkedin"]
+        assert kwargs["search_term"] == "developer"
+        assert kwargs["location"] == "Vancouver"
+        assert kwargs["hours_old"] == 168
+        assert kwargs["country_indeed"] == "Canada"
+        assert kwargs["results_wanted"] == 20
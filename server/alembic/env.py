@@ -25,6 +25,7 @@ from sqlalchemy import engine_from_config, pool
 from sqlmodel import SQLModel
 
 from alembic import context
+from app.component.alembic_helpers import get_inspector
 from app.component.environment import auto_import, env_not_empty
 
 # this is the Alembic Config object, which provides
@@ -105,6 +106,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=str(url).startswith("sqlite"),
     )
 
     with context.begin_transaction():
@@ -118,32 +120,56 @@ def include_object(object, name, type_, reflected, compare_to):
     return True
 
 
+def forget_reflection(ctx, step, heads, run_args):
+    """Drop the shared Inspector's cache after each revision so the next one sees its DDL."""
+    get_inspector(ctx.connection).clear_cache()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        render_item=render_item,
+        include_object=include_object,
+        target_metadata=target_metadata,
+        on_version_apply=forget_reflection,
+        # SQLite has no ALTER COLUMN; batch mode copies the table once per batch
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
     In this scenario we need to create an Engine
-    and associate a connection with the context.
+    and associate a connection with the context.  When called in-process by
+    app.component.auto_migrate, a connection from the application engine is
+    passed in ``config.attributes`` and used instead.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        # Without transactional DDL (SQLite) the connection can be left in an
+        # autobegun transaction; end it, as closing a connection of our own
+        # would, so the next command on it doesn't run as an external one
+        connection.commit()
+        return
+
     options = config.get_section(config.config_ini_section, {})
     options["sqlalchemy.url"] = env_not_empty("database_url")
     connectable = engine_from_config(
         options,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        # Room for every distinct statement of a full upgrade from an empty database
+        query_cache_size=1200,
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            render_item=render_item,
-            include_object=include_object,
-            target_metadata=target_metadata,
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
-
+        do_run_migrations(connection)
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,297 @@
+"""Squashed baseline for the 2026-01 usage, billing, job hunt and plan revisions
+
+Replaces, for fresh installs only:
+    add_usage_record_table, add_clerk_id_to_user, add_stripe_fields_to_user,
+    add_job_hunt_tables, 2026_01_29_0001, 2026_01_30_0001
+
+Applied by app.component.auto_migrate on an empty database.  It runs on top of
+``down_revision`` in one transaction and then stamps ``revision``, instead of
+six separate revisions with their existence probes, autocommit index blocks
+and version-table updates.  It lives outside alembic/versions so it is not
+part of the revision graph: existing databases and incremental upgrades keep
+using the individual revisions, which stay the source of truth.  Keep this
+file in step with them.
+
+Create Date: 2026-01-30
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateColumn
+
+
+# The revision this baseline builds on and the one it leaves the database at
+down_revision: str = 'add_daytona_user_settings'
+revision: str = '2026_01_30_0001'
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True),
+    ]
+
+
+def _add_columns(table_name: str, columns: list[sa.Column]) -> None:
+    """Add columns with a single ALTER TABLE where the dialect supports it."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for column in columns:
+            op.add_column(table_name, column)
+        return
+    clauses = ', '.join(f'ADD COLUMN {CreateColumn(column).compile(dialect=bind.dialect)}' for column in columns)
+    op.execute(f'ALTER TABLE {bind.dialect.identifier_preparer.quote(table_name)} {clauses}')
+
+
+def upgrade() -> None:
+    # user: clerk, Stripe and token billing fields
+    _add_columns('user', [
+        sa.Column('clerk_id', sa.String(255), nullable=True),
+        sa.Column('stripe_customer_id', sa.String(255), nullable=True),
+        sa.Column('subscription_plan', sa.String(32), nullable=False, server_default='free'),
+        sa.Column('stripe_subscription_id', sa.String(255), nullable=True),
+        sa.Column('subscription_status', sa.String(64), nullable=True),
+        sa.Column('subscription_period_end', sa.DateTime(), nullable=True),
+        sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True),
+        sa.Column('monthly_spending_alert_sent', sa.Boolean(), server_default='0', nullable=True),
+    ])
+    op.create_index('ix_user_clerk_id', 'user', ['clerk_id'], unique=True)
+    op.create_index('ix_user_stripe_customer_id', 'user', ['stripe_customer_id'], unique=True)
+    op.create_index('ix_user_subscription_plan', 'user', ['subscription_plan'], unique=False)
+
+    op.create_table(
+        'usage_record',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('task_id', sa.String(64), nullable=False, index=True),
+        sa.Column('project_id', sa.String(64), nullable=True, index=True),
+        sa.Column('agent_name', sa.String(64), nullable=False, index=True),
+        sa.Column('agent_step', sa.Integer(), nullable=True),
+        sa.Column('model_platform', sa.String(64), nullable=False),
+        sa.Column('model_type', sa.String(128), nullable=False),
+        sa.Column('input_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('output_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('estimated_cost', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('execution_time_ms', sa.Integer(), nullable=True),
+        sa.Column('success', sa.Boolean(), nullable=False, server_default='1'),
+        sa.Column('error_message', sa.String(512), nullable=True),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        *_timestamps(),
+        sa.Index('idx_usage_user_created', 'user_id', 'created_at'),
+        sa.Index('idx_usage_task_agent', 'task_id', 'agent_name'),
+    )
+
+    op.create_table(
+        'user_resume',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('file_name', sa.String(255), nullable=False),
+        sa.Column('name', sa.String(255), nullable=True, server_default=''),
+        sa.Column('email', sa.String(255), nullable=True, server_default=''),
+        sa.Column('phone', sa.String(50), nullable=True, server_default=''),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('skills', sa.JSON(), nullable=True),
+        sa.Column('experience', sa.JSON(), nullable=True),
+        sa.Column('education', sa.JSON(), nullable=True),
+        sa.Column('certifications', sa.JSON(), nullable=True),
+        sa.Column('languages', sa.JSON(), nullable=True),
+        sa.Column('raw_text', sa.Text(), nullable=True),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'scraped_job',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('url_hash', sa.String(32), nullable=False, unique=True, index=True),
+        sa.Column('session_id', sa.Integer(), nullable=True, index=True),
+        sa.Column('title', sa.String(500), nullable=False),
+        sa.Column('company', sa.String(255), nullable=False),
+        sa.Column('location', sa.String(255), nullable=True, server_default=''),
+        sa.Column('job_url', sa.String(1000), nullable=False),
+        sa.Column('job_url_direct', sa.String(1000), nullable=True, server_default=''),
+        sa.Column('source', sa.String(50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('job_type', sa.String(50), nullable=True, server_default=''),
+        sa.Column('is_remote', sa.Boolean(), nullable=False, server_default='0'),
+        sa.Column('salary_min', sa.Float(), nullable=True),
+        sa.Column('salary_max', sa.Float(), nullable=True),
+        sa.Column('salary_currency', sa.String(10), nullable=True, server_default='USD'),
+        sa.Column('salary_interval', sa.String(20), nullable=True, server_default='yearly'),
+        sa.Column('posted_date', sa.TIMESTAMP(), nullable=True),
+        sa.Column('company_url', sa.String(500), nullable=True, server_default=''),
+        sa.Column('company_logo', sa.String(500), nullable=True, server_default=''),
+        sa.Column('emails', sa.JSON(), nullable=True),
+        sa.Column('required_skills', sa.JSON(), nullable=True),
+        sa.Column('preferred_skills', sa.JSON(), nullable=True),
+        sa.Column('experience_years', sa.Integer(), nullable=True),
+        sa.Column('education_requirement', sa.String(255), nullable=True, server_default=''),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'job_analysis',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('resume_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('job_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('overall_score', sa.Float(), nullable=False),
+        sa.Column('skill_match_score', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('experience_match_score', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('education_match_score', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('keyword_match_score', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('matching_skills', sa.JSON(), nullable=True),
+        sa.Column('missing_skills', sa.JSON(), nullable=True),
+        sa.Column('keyword_overlap', sa.JSON(), nullable=True),
+        sa.Column('strengths', sa.JSON(), nullable=True),
+        sa.Column('weaknesses', sa.JSON(), nullable=True),
+        sa.Column('recommendations', sa.JSON(), nullable=True),
+        sa.Column('fit_level', sa.String(50), nullable=True, server_default=''),
+        sa.Column('interview_likelihood', sa.String(50), nullable=True, server_default=''),
+        sa.Column('analysis_report', sa.Text(), nullable=True),
+        *_timestamps(),
+        sa.Index('ix_job_analysis_resume_job', 'resume_id', 'job_id'),
+    )
+
+    op.create_table(
+        'tailored_resume',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('analysis_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('original_resume_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('job_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('format', sa.String(20), nullable=False),
+        sa.Column('tailored_content', sa.Text(), nullable=True),
+        sa.Column('optimizations_made', sa.JSON(), nullable=True),
+        sa.Column('keywords_added', sa.JSON(), nullable=True),
+        sa.Column('ats_score', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('improvement_delta', sa.Float(), nullable=True, server_default='0'),
+        sa.Column('cover_letter_path', sa.String(500), nullable=True),
+        sa.Column('cover_letter_content', sa.Text(), nullable=True),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'job_hunt_session',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('project_id', sa.String(64), nullable=False, index=True),
+        sa.Column('task_id', sa.String(64), nullable=False, index=True),
+        sa.Column('resume_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('search_criteria', sa.JSON(), nullable=True),
+        sa.Column('status', sa.SmallInteger(), nullable=False, server_default='1'),
+        sa.Column('status_message', sa.String(500), nullable=True, server_default=''),
+        sa.Column('jobs_found_count', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('jobs_analyzed_count', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('jobs_tailored_count', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('job_ids', sa.JSON(), nullable=True),
+        sa.Column('analysis_ids', sa.JSON(), nullable=True),
+        sa.Column('tailored_resume_ids', sa.JSON(), nullable=True),
+        sa.Column('auto_analyze', sa.Boolean(), nullable=False, server_default='1'),
+        sa.Column('auto_tailor_top_n', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('min_score_threshold', sa.Float(), nullable=False, server_default='60'),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'user_usage_summary',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('billing_year', sa.Integer(), nullable=False),
+        sa.Column('billing_month', sa.Integer(), nullable=False),
+        sa.Column('total_input_tokens', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('total_output_tokens', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('free_tokens_used', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('paid_tokens_used', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('total_spending', sa.Float(), server_default='0.0', nullable=True),
+        sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True),
+        sa.Column('alert_threshold_reached', sa.Boolean(), server_default='0', nullable=True),
+        sa.Column('alert_sent_at', sa.DateTime(), nullable=True),
+        sa.Column('limit_reached', sa.Boolean(), server_default='0', nullable=True),
+        sa.Column('limit_reached_at', sa.DateTime(), nullable=True),
+        sa.Column('model_usage_breakdown', sa.Text(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.Index('ix_user_usage_summary_user_id', 'user_id'),
+        sa.Index('ix_user_usage_summary_billing_period', 'user_id', 'billing_year', 'billing_month', unique=True),
+    )
+
+    op.create_table(
+        'userprivacy',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('pricacy_setting', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, onupdate=sa.func.now()),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+    )
+
+    op.create_table(
+        'execution_plan',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.String(64), nullable=False),
+        sa.Column('task_id', sa.String(64), nullable=False),
+        sa.Column('plan_id', sa.String(128), nullable=False),
+        sa.Column('title', sa.String(512), nullable=False),
+        sa.Column('status', sa.SmallInteger(), nullable=False, default=1),
+        sa.Column('steps', sa.JSON(), nullable=True),
+        sa.Column('current_step_index', sa.Integer(), nullable=False, default=0),
+        sa.Column('total_steps', sa.Integer(), nullable=False, default=0),
+        sa.Column('completed_steps', sa.Integer(), nullable=False, default=0),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, onupdate=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_execution_plan_user_id', 'user_id'),
+        sa.Index('ix_execution_plan_project_id', 'project_id'),
+        sa.Index('ix_execution_plan_task_id', 'task_id'),
+        sa.Index('ix_execution_plan_plan_id', 'plan_id', unique=True),
+    )
+
+    op.create_table(
+        'plan_step',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('plan_id', sa.String(128), nullable=False),
+        sa.Column('step_index', sa.Integer(), nullable=False, default=0),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('agent_type', sa.String(64), nullable=True),
+        sa.Column('status', sa.SmallInteger(), nullable=False, default=0),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, onupdate=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_plan_step_plan_id', 'plan_id'),
+    )
+
+    op.create_table(
+        'plan_step_log',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('plan_id', sa.Integer(), nullable=False),
+        sa.Column('step_index', sa.Integer(), nullable=False),
+        sa.Column('log_index', sa.Integer(), nullable=False, default=0),
+        sa.Column('toolkit', sa.String(128), nullable=False),
+        sa.Column('method', sa.String(128), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(32), nullable=False, default='completed'),
+        sa.Column('full_output', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, onupdate=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_plan_step_log_plan_id', 'plan_id'),
+        sa.Index('ix_plan_step_log_step_index', 'step_index'),
+    )
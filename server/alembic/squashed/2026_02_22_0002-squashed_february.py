@@ -0,0 +1,176 @@
+"""Squashed baseline for the 2026-02 admin, billing, IM channel and chat revisions
+
+Replaces, for fresh installs only:
+    2026_02_07_0001, 2026_02_07_0002, 2026_02_08_0001, 2026_02_12_0001,
+    2026_02_15_0001, 2026_02_15_0002, 2026_02_16_0001, 2026_02_17_0001,
+    2026_02_17_0002, 2026_02_18_0001, 2026_02_20_0001, 2026_02_22_0001
+
+It omits the single-column indexes that 2026_02_23_0014 drops again.
+
+Applied by app.component.auto_migrate after 2026_01_30_0002-squashed_baseline,
+in one transaction, followed by a stamp of ``revision``.  The data copy in
+2026_02_17_0001 is skipped: an empty database has no telegram mappings.  Like
+the other squashed baselines this is outside the revision graph and must be
+kept in step with the revisions it replaces.
+
+Create Date: 2026-02-22
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# The revision this baseline builds on and the one it leaves the database at
+down_revision: str = '2026_01_30_0001'
+revision: str = '2026_02_22_0001'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'admin_llm_config',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('provider_name', sa.String(64), nullable=False),
+        sa.Column('display_name', sa.String(128), nullable=True, server_default=''),
+        sa.Column('api_key', sa.Text(), nullable=False),
+        sa.Column('endpoint_url', sa.String(512), nullable=True, server_default=''),
+        sa.Column('extra_config', sa.JSON(), nullable=True),
+        sa.Column('status', sa.SmallInteger(), nullable=True, server_default='1'),
+        sa.Column('priority', sa.SmallInteger(), nullable=True, server_default='0'),
+        sa.Column('rate_limit_rpm', sa.Integer(), nullable=True),
+        sa.Column('rate_limit_tpm', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True, server_default=''),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('model_type', sa.String(128), nullable=True, server_default=''),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider_name', name='uix_admin_llm_config_provider'),
+    )
+    op.create_table(
+        'admin_model_pricing',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('provider_name', sa.String(64), nullable=False),
+        sa.Column('model_name', sa.String(128), nullable=False),
+        sa.Column('display_name', sa.String(256), nullable=True, server_default=''),
+        sa.Column('input_price_per_million', sa.Numeric(10, 4), nullable=True, server_default='0'),
+        sa.Column('output_price_per_million', sa.Numeric(10, 4), nullable=True, server_default='0'),
+        sa.Column('cost_tier', sa.String(20), nullable=True, server_default="'standard'"),
+        sa.Column('context_length', sa.Integer(), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=True, server_default=sa.true()),
+        sa.Column('notes', sa.Text(), nullable=True, server_default=''),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider_name', 'model_name', name='uix_admin_model_pricing_provider_model'),
+    )
+
+    for table_name in ('execution_plan', 'plan_step', 'plan_step_log'):
+        op.add_column(table_name, sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # user: bot channels, dollar credits and referral codes
+    op.add_column('user', sa.Column('bot_channels', sa.JSON(), nullable=True))
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column(
+            'credits',
+            existing_type=sa.Integer(), type_=sa.Float(), existing_server_default=sa.text('0'), existing_nullable=True,
+        )
+    op.add_column('user', sa.Column('invite_code', sa.String(32), nullable=True))
+    op.create_index(
+        'ux_user_invite_code', 'user', ['invite_code'], unique=True,
+        postgresql_where=sa.text('invite_code IS NOT NULL'),
+    )
+
+    op.create_table(
+        'order',
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('order_type', sa.SmallInteger(), nullable=True),
+        sa.Column('price', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('status', sa.SmallInteger(), nullable=True),
+        sa.Column('payment_method', sa.String(32), server_default='', nullable=False),
+        sa.Column('stripe_id', sa.String(1024), nullable=False),
+        sa.Column('third_party_id', sa.String(1024), nullable=True),
+        sa.Column('plan_id', sa.Integer(), nullable=True),
+        sa.Column('period', sa.String(16), nullable=True),
+        sa.Column('buy_type', sa.Integer(), nullable=True),
+        sa.Column('use_num', sa.Integer(), nullable=True),
+        sa.Column('left_num', sa.Integer(), nullable=True),
+        sa.Column('extra', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['plan_id'], ['plan.id']),
+        sa.Index('ix_order_user_id', 'user_id'),
+        sa.Index('ux_order_stripe_id', 'stripe_id', unique=True),
+    )
+
+    op.create_table(
+        'channel_user_mapping',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False, index=True),
+        sa.Column('channel_type', sa.String(32), nullable=False),
+        sa.Column('channel_user_id', sa.String(128), nullable=False),
+        sa.Column('channel_username', sa.String(128), nullable=True),
+        sa.Column('channel_metadata', sa.JSON(), nullable=True),
+        sa.Column('auto_registered', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('linked_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('channel_type', 'channel_user_id', name='uq_channel_identity'),
+    )
+    op.create_table(
+        'channel_linking_code',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False, index=True),
+        sa.Column('channel_type', sa.String(32), nullable=False, index=True),
+        sa.Column('code', sa.String(16), nullable=False, unique=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('used', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    )
+
+    admin_settings = op.create_table(
+        'admin_settings',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('key', sa.String(100), nullable=False, unique=True, index=True),
+        sa.Column('value', sa.Text(), nullable=False, server_default=''),
+        sa.Column('description', sa.Text(), nullable=True, server_default=''),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(
+        admin_settings.insert().values(
+            key='additional_fee_percent',
+            value='5',
+            description='Percentage fee added on top of base model token costs for cloud models',
+            created_at=sa.func.now(),
+            updated_at=sa.func.now(),
+        )
+    )
+
+    with op.batch_alter_table('chat_history') as batch_op:
+        batch_op.alter_column('project_name', existing_type=sa.String(128), type_=sa.String(512), existing_nullable=True)
+        batch_op.alter_column('summary', existing_type=sa.String(1024), type_=sa.Text(), existing_nullable=True)
+
+    op.create_table(
+        'chat_file',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('task_id', sa.String(255), nullable=False, index=True),
+        sa.Column('filename', sa.String(512), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('mime_type', sa.String(255), nullable=False, server_default='application/octet-stream'),
+        sa.Column('storage_path', sa.String(1024), nullable=False),
+        sa.Column('url', sa.String(1024), nullable=False),
+        sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
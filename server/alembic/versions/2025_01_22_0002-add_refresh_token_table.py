@@ -24,7 +24,7 @@ def upgrade() -> None:
     """Create refresh_token table for web mode JWT authentication."""
     op.create_table(
         "refresh_token",
-        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("id", sa.Integer(), nullable=False),
         sa.Column("user_id", sa.Integer(), nullable=False),
         sa.Column("token_hash", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
         sa.Column("device_info", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
@@ -35,17 +35,20 @@ def upgrade() -> None:
         sa.Column("is_revoked", sa.Boolean(), server_default=sa.text("FALSE"), nullable=False),
         sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=False,
     )
     
     # Create indexes for efficient lookups
-    op.create_index("ix_refresh_token_user_id", "refresh_token", ["user_id"])
-    op.create_index("ix_refresh_token_token_hash", "refresh_token", ["token_hash"], unique=True)
-    op.create_index("ix_refresh_token_expires_at", "refresh_token", ["expires_at"])
+    with op.batch_alter_table("refresh_token") as batch_op:
+        batch_op.create_index("ix_refresh_token_user_id", ["user_id"])
+        batch_op.create_index("ix_refresh_token_token_hash", ["token_hash"], unique=True)
+        batch_op.create_index("ix_refresh_token_expires_at", ["expires_at"])
 
 
 def downgrade() -> None:
     """Drop refresh_token table."""
-    op.drop_index("ix_refresh_token_expires_at", table_name="refresh_token")
-    op.drop_index("ix_refresh_token_token_hash", table_name="refresh_token")
-    op.drop_index("ix_refresh_token_user_id", table_name="refresh_token")
+    with op.batch_alter_table("refresh_token") as batch_op:
+        batch_op.drop_index("ix_refresh_token_expires_at")
+        batch_op.drop_index("ix_refresh_token_token_hash")
+        batch_op.drop_index("ix_refresh_token_user_id")
     op.drop_table("refresh_token")
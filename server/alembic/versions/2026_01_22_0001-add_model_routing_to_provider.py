@@ -20,13 +20,15 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add assigned_agents column (JSON array of agent names)
-    op.add_column('provider', sa.Column('assigned_agents', sa.JSON(), nullable=True, server_default='[]'))
-    
-    # Add cost_tier column (cheap, standard, premium)
-    op.add_column('provider', sa.Column('cost_tier', sa.String(20), nullable=True, server_default='standard'))
+    with op.batch_alter_table('provider') as batch_op:
+        # Add assigned_agents column (JSON array of agent names)
+        batch_op.add_column(sa.Column('assigned_agents', sa.JSON(), nullable=True, server_default='[]'))
+
+        # Add cost_tier column (cheap, standard, premium)
+        batch_op.add_column(sa.Column('cost_tier', sa.String(20), nullable=True, server_default='standard'))
 
 
 def downgrade() -> None:
-    op.drop_column('provider', 'assigned_agents')
-    op.drop_column('provider', 'cost_tier')
+    with op.batch_alter_table('provider') as batch_op:
+        batch_op.drop_column('cost_tier')
+        batch_op.drop_column('assigned_agents')
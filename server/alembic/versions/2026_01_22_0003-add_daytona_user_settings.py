@@ -26,7 +26,7 @@ def upgrade() -> None:
     # Create user_daytona_settings table
     op.create_table(
         "user_daytona_settings",
-        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("id", sa.Integer(), nullable=False),
         sa.Column("user_id", sa.Integer(), nullable=False),
         sa.Column("encrypted_api_key", sqlmodel.sql.sqltypes.AutoString(length=512), nullable=True),
         sa.Column("server_url", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False, server_default="https://app.daytona.io"),
@@ -43,13 +43,15 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
         sa.UniqueConstraint("user_id", name="uix_user_daytona_settings_user_id"),
+        sqlite_autoincrement=False,
     )
-    op.create_index("ix_user_daytona_settings_user_id", "user_daytona_settings", ["user_id"])
+    with op.batch_alter_table("user_daytona_settings") as batch_op:
+        batch_op.create_index("ix_user_daytona_settings_user_id", ["user_id"])
     
     # Create user_sandbox_session table
     op.create_table(
         "user_sandbox_session",
-        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("id", sa.Integer(), nullable=False),
         sa.Column("user_id", sa.Integer(), nullable=False),
         sa.Column("sandbox_id", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
         sa.Column("daytona_sandbox_id", sqlmodel.sql.sqltypes.AutoString(length=128), nullable=True),
@@ -67,24 +69,28 @@ def upgrade() -> None:
         sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
         sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=False,
     )
-    op.create_index("ix_user_sandbox_session_user_id", "user_sandbox_session", ["user_id"])
-    op.create_index("ix_user_sandbox_session_sandbox_id", "user_sandbox_session", ["sandbox_id"])
-    op.create_index("ix_user_sandbox_session_chat_session_id", "user_sandbox_session", ["chat_session_id"])
-    op.create_index("ix_sandbox_session_user_status", "user_sandbox_session", ["user_id", "status"])
-    op.create_index("ix_sandbox_session_daytona_id", "user_sandbox_session", ["daytona_sandbox_id"])
+    with op.batch_alter_table("user_sandbox_session") as batch_op:
+        batch_op.create_index("ix_user_sandbox_session_user_id", ["user_id"])
+        batch_op.create_index("ix_user_sandbox_session_sandbox_id", ["sandbox_id"])
+        batch_op.create_index("ix_user_sandbox_session_chat_session_id", ["chat_session_id"])
+        batch_op.create_index("ix_sandbox_session_user_status", ["user_id", "status"])
+        batch_op.create_index("ix_sandbox_session_daytona_id", ["daytona_sandbox_id"])
 
 
 def downgrade() -> None:
     """Drop user_daytona_settings and user_sandbox_session tables."""
     # Drop user_sandbox_session indexes and table
-    op.drop_index("ix_sandbox_session_daytona_id", table_name="user_sandbox_session")
-    op.drop_index("ix_sandbox_session_user_status", table_name="user_sandbox_session")
-    op.drop_index("ix_user_sandbox_session_chat_session_id", table_name="user_sandbox_session")
-    op.drop_index("ix_user_sandbox_session_sandbox_id", table_name="user_sandbox_session")
-    op.drop_index("ix_user_sandbox_session_user_id", table_name="user_sandbox_session")
+    with op.batch_alter_table("user_sandbox_session") as batch_op:
+        batch_op.drop_index("ix_sandbox_session_daytona_id")
+        batch_op.drop_index("ix_sandbox_session_user_status")
+        batch_op.drop_index("ix_user_sandbox_session_chat_session_id")
+        batch_op.drop_index("ix_user_sandbox_session_sandbox_id")
+        batch_op.drop_index("ix_user_sandbox_session_user_id")
     op.drop_table("user_sandbox_session")
     
     # Drop user_daytona_settings indexes and table
-    op.drop_index("ix_user_daytona_settings_user_id", table_name="user_daytona_settings")
+    with op.batch_alter_table("user_daytona_settings") as batch_op:
+        batch_op.drop_index("ix_user_daytona_settings_user_id")
     op.drop_table("user_daytona_settings")
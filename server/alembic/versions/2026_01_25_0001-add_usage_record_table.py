@@ -57,12 +57,21 @@ def upgrade() -> None:
         sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True),
     )
     
-    # Create composite indexes for common queries
-    op.create_index('idx_usage_user_created', 'usage_record', ['user_id', 'created_at'])
-    op.create_index('idx_usage_task_agent', 'usage_record', ['task_id', 'agent_name'])
+    # Create composite indexes for common queries. Built CONCURRENTLY outside
+    # the migration transaction so inserts into usage_record are not blocked.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_usage_user_created', 'usage_record', ['user_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'idx_usage_task_agent', 'usage_record', ['task_id', 'agent_name'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
-    op.drop_index('idx_usage_task_agent', table_name='usage_record')
-    op.drop_index('idx_usage_user_created', table_name='usage_record')
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_usage_task_agent', table_name='usage_record', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_usage_user_created', table_name='usage_record', postgresql_concurrently=True, if_exists=True)
     op.drop_table('usage_record')
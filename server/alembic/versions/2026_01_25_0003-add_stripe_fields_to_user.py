@@ -9,6 +9,7 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.schema import CreateColumn
 
 
 # revision identifiers, used by Alembic.
@@ -17,26 +18,83 @@ down_revision: Union[str, None] = 'add_clerk_id_to_user'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Rows updated per statement while backfilling subscription_plan
+_BACKFILL_BATCH = 10_000
+
+# NOT VALID check standing in for NOT NULL until 2026_02_23_0004 validates it
+_SUBSCRIPTION_PLAN_NOT_NULL = 'ck_user_subscription_plan_not_null'
+
+
+def _add_columns(table_name: str, columns: list[sa.Column]) -> None:
+    """Add columns with a single ALTER TABLE where the dialect supports it."""
+    if not columns:
+        return
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for column in columns:
+            op.add_column(table_name, column)
+        return
+    clauses = ', '.join(f'ADD COLUMN {CreateColumn(column).compile(dialect=bind.dialect)}' for column in columns)
+    op.execute(f'ALTER TABLE {bind.dialect.identifier_preparer.quote(table_name)} {clauses}')
+
+
+def _backfill_subscription_plan() -> None:
+    """Fill NULL subscription_plan values in id-range batches, one commit per batch."""
+    bind = op.get_bind()
+    lo, hi = bind.execute(sa.text('SELECT min(id), max(id) FROM "user"')).one()
+    if lo is None:
+        return
+    with op.get_context().autocommit_block():
+        for start in range(lo, hi + 1, _BACKFILL_BATCH):
+            op.execute(
+                sa.text(
+                    'UPDATE "user" SET subscription_plan = \'free\' '
+                    'WHERE subscription_plan IS NULL AND id BETWEEN :lo AND :hi'
+                ).bindparams(lo=start, hi=start + _BACKFILL_BATCH - 1)
+            )
+
 
 def upgrade() -> None:
-    # Add Stripe payment fields to user table
-    op.add_column('user', sa.Column('stripe_customer_id', sa.String(255), nullable=True))
-    op.add_column('user', sa.Column('subscription_plan', sa.String(32), nullable=False, server_default='free'))
-    op.add_column('user', sa.Column('stripe_subscription_id', sa.String(255), nullable=True))
-    op.add_column('user', sa.Column('subscription_status', sa.String(64), nullable=True))
-    op.add_column('user', sa.Column('subscription_period_end', sa.DateTime(), nullable=True))
-    
-    # Add index for stripe_customer_id for faster lookups
-    op.create_index('ix_user_stripe_customer_id', 'user', ['stripe_customer_id'], unique=True)
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+
+    # Add Stripe payment fields to user table in one ALTER, so the table lock
+    # is taken once rather than per column. On PostgreSQL subscription_plan is
+    # added nullable and tightened without a locked table scan: backfill, then
+    # a NOT VALID check here, validated in 2026_02_23_0004.
+    _add_columns('user', [
+        sa.Column('stripe_customer_id', sa.String(255), nullable=True),
+        sa.Column('subscription_plan', sa.String(32), nullable=postgresql, server_default='free'),
+        sa.Column('stripe_subscription_id', sa.String(255), nullable=True),
+        sa.Column('subscription_status', sa.String(64), nullable=True),
+        sa.Column('subscription_period_end', sa.DateTime(), nullable=True),
+    ])
+    if postgresql:
+        _backfill_subscription_plan()
+        op.execute(
+            f'ALTER TABLE "user" ADD CONSTRAINT {_SUBSCRIPTION_PLAN_NOT_NULL} '
+            'CHECK (subscription_plan IS NOT NULL) NOT VALID'
+        )
     
-    # Add index for subscription_plan for filtering users by plan
-    op.create_index('ix_user_subscription_plan', 'user', ['subscription_plan'], unique=False)
+    # Indexes are built CONCURRENTLY outside the transaction so user writes
+    # are not blocked while they build
+    with op.get_context().autocommit_block():
+        # Add index for stripe_customer_id for faster lookups
+        op.create_index(
+            'ix_user_stripe_customer_id', 'user', ['stripe_customer_id'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Add index for subscription_plan for filtering users by plan
+        op.create_index(
+            'ix_user_subscription_plan', 'user', ['subscription_plan'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
     # Drop indexes
-    op.drop_index('ix_user_subscription_plan', table_name='user')
-    op.drop_index('ix_user_stripe_customer_id', table_name='user')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_subscription_plan', table_name='user', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_user_stripe_customer_id', table_name='user', postgresql_concurrently=True, if_exists=True)
     
     # Drop columns
     op.drop_column('user', 'subscription_period_end')
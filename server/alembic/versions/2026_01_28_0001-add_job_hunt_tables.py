@@ -227,12 +227,20 @@ def upgrade() -> None:
         sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True),
     )
     
-    # Create composite index for job analysis lookups
-    op.create_index('ix_job_analysis_resume_job', 'job_analysis', ['resume_id', 'job_id'])
+    # Create composite index for job analysis lookups, CONCURRENTLY so writes
+    # to job_analysis continue while it is built
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_analysis_resume_job', 'job_analysis', ['resume_id', 'job_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
-    op.drop_index('ix_job_analysis_resume_job', 'job_analysis')
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_job_analysis_resume_job', table_name='job_analysis', postgresql_concurrently=True, if_exists=True
+        )
     op.drop_table('job_hunt_session')
     op.drop_table('tailored_resume')
     op.drop_table('job_analysis')
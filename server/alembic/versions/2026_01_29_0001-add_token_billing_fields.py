@@ -11,6 +11,7 @@ Create Date: 2026-01-29
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.schema import CreateColumn
 
 
 # revision identifiers, used by Alembic.
@@ -20,87 +21,95 @@ branch_labels = None
 depends_on = None
 
 
-def _table_exists(name: str) -> bool:
+def _add_columns(table_name: str, columns: list[sa.Column]) -> None:
+    """Add missing columns with a single ALTER TABLE where the dialect supports it."""
     bind = op.get_bind()
-    inspector = sa_inspect(bind)
-    return name in inspector.get_table_names()
+    if bind.dialect.name != 'postgresql':
+        # SQLite and MySQL have no ADD COLUMN IF NOT EXISTS; check the catalog instead
+        existing = {col['name'] for col in sa_inspect(bind).get_columns(table_name)}
+        for column in columns:
+            if column.name not in existing:
+                op.add_column(table_name, column)
+        return
+    clauses = ', '.join(
+        f'ADD COLUMN IF NOT EXISTS {CreateColumn(column).compile(dialect=bind.dialect)}' for column in columns
+    )
+    op.execute(f'ALTER TABLE {bind.dialect.identifier_preparer.quote(table_name)} {clauses}')
 
 
-def _column_exists(table_name: str, column_name: str) -> bool:
+def _create_index(index_name: str, table_name: str, columns: list[str], unique: bool = False) -> None:
+    """Create an index unless it exists; CONCURRENTLY and IF NOT EXISTS on PostgreSQL."""
     bind = op.get_bind()
-    inspector = sa_inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
-def _index_exists(table_name: str, index_name: str) -> bool:
-    bind = op.get_bind()
-    inspector = sa_inspect(bind)
-    try:
-        indexes = inspector.get_indexes(table_name)
-        return any(idx['name'] == index_name for idx in indexes)
-    except Exception:
-        return False
+    if bind.dialect.name == 'postgresql':
+        op.create_index(
+            index_name, table_name, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True
+        )
+    elif index_name not in {idx['name'] for idx in sa_inspect(bind).get_indexes(table_name)}:
+        # MySQL has no CREATE INDEX IF NOT EXISTS
+        op.create_index(index_name, table_name, columns, unique=unique)
 
 
 def upgrade() -> None:
-    # Add token-based billing fields to user table
-    if not _column_exists('user', 'spending_limit'):
-        op.add_column('user', sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True))
-    if not _column_exists('user', 'monthly_spending_alert_sent'):
-        op.add_column('user', sa.Column('monthly_spending_alert_sent', sa.Boolean(), server_default='0', nullable=True))
+    # Every statement below is IF NOT EXISTS, so the database does the existence
+    # checks instead of a round of catalog queries before each DDL (except for
+    # added columns outside PostgreSQL, see _add_columns).
+
+    # Add token-based billing fields to user table in one ALTER
+    _add_columns('user', [
+        sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True),
+        sa.Column('monthly_spending_alert_sent', sa.Boolean(), server_default='0', nullable=True),
+    ])
     
     # Create user_usage_summary table for monthly billing tracking
-    if not _table_exists('user_usage_summary'):
-        op.create_table(
-            'user_usage_summary',
-            sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
-            sa.Column('user_id', sa.Integer(), nullable=False),
-            sa.Column('billing_year', sa.Integer(), nullable=False),
-            sa.Column('billing_month', sa.Integer(), nullable=False),
-            sa.Column('total_input_tokens', sa.Integer(), server_default='0', nullable=True),
-            sa.Column('total_output_tokens', sa.Integer(), server_default='0', nullable=True),
-            sa.Column('free_tokens_used', sa.Integer(), server_default='0', nullable=True),
-            sa.Column('paid_tokens_used', sa.Integer(), server_default='0', nullable=True),
-            sa.Column('total_spending', sa.Float(), server_default='0.0', nullable=True),
-            sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True),
-            sa.Column('alert_threshold_reached', sa.Boolean(), server_default='0', nullable=True),
-            sa.Column('alert_sent_at', sa.DateTime(), nullable=True),
-            sa.Column('limit_reached', sa.Boolean(), server_default='0', nullable=True),
-            sa.Column('limit_reached_at', sa.DateTime(), nullable=True),
-            sa.Column('model_usage_breakdown', sa.Text(), nullable=True),
-            sa.Column('deleted_at', sa.DateTime(), nullable=True),
-            sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
-            sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
-            sa.PrimaryKeyConstraint('id'),
-            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
-        )
-    else:
-        # Table existed (e.g. created by SQLModel create_all) — ensure all columns are present
-        for col_name, col_def in [
-            ('deleted_at', sa.Column('deleted_at', sa.DateTime(), nullable=True)),
-            ('created_at', sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True)),
-            ('updated_at', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True)),
-        ]:
-            if not _column_exists('user_usage_summary', col_name):
-                op.add_column('user_usage_summary', col_def)
+    op.create_table(
+        'user_usage_summary',
+        sa.Column('id', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('billing_year', sa.Integer(), nullable=False),
+        sa.Column('billing_month', sa.Integer(), nullable=False),
+        sa.Column('total_input_tokens', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('total_output_tokens', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('free_tokens_used', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('paid_tokens_used', sa.Integer(), server_default='0', nullable=True),
+        sa.Column('total_spending', sa.Float(), server_default='0.0', nullable=True),
+        sa.Column('spending_limit', sa.Float(), server_default='100.0', nullable=True),
+        sa.Column('alert_threshold_reached', sa.Boolean(), server_default='0', nullable=True),
+        sa.Column('alert_sent_at', sa.DateTime(), nullable=True),
+        sa.Column('limit_reached', sa.Boolean(), server_default='0', nullable=True),
+        sa.Column('limit_reached_at', sa.DateTime(), nullable=True),
+        sa.Column('model_usage_breakdown', sa.Text(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        if_not_exists=True,
+    )
+    # The table may predate this revision (e.g. created by SQLModel create_all)
+    # without the timestamp columns
+    _add_columns('user_usage_summary', [
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    ])
     
-    # Create index for faster lookups by user and billing period
-    if not _index_exists('user_usage_summary', 'ix_user_usage_summary_user_id'):
-        op.create_index('ix_user_usage_summary_user_id', 'user_usage_summary', ['user_id'])
-    if not _index_exists('user_usage_summary', 'ix_user_usage_summary_billing_period'):
-        op.create_index(
-            'ix_user_usage_summary_billing_period', 
-            'user_usage_summary', 
+    # Create index for faster lookups by user and billing period. The table may
+    # already hold rows (see above), so build the indexes CONCURRENTLY.
+    with op.get_context().autocommit_block():
+        _create_index('ix_user_usage_summary_user_id', 'user_usage_summary', ['user_id'])
+        _create_index(
+            'ix_user_usage_summary_billing_period',
+            'user_usage_summary',
             ['user_id', 'billing_year', 'billing_month'],
-            unique=True
+            unique=True,
         )
 
 
 def downgrade() -> None:
     # Drop user_usage_summary table
-    op.drop_index('ix_user_usage_summary_billing_period', table_name='user_usage_summary')
-    op.drop_index('ix_user_usage_summary_user_id', table_name='user_usage_summary')
+    with op.get_context().autocommit_block():
+        for index_name in ('ix_user_usage_summary_billing_period', 'ix_user_usage_summary_user_id'):
+            op.drop_index(index_name, table_name='user_usage_summary', postgresql_concurrently=True, if_exists=True)
     op.drop_table('user_usage_summary')
     
     # Remove columns from user table
@@ -9,7 +9,9 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.engine import Inspector
+
+from app.component.alembic_helpers import get_inspector
 
 # revision identifiers, used by Alembic.
 revision: str = '2026_02_07_0002'
@@ -18,15 +20,13 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _column_exists(table_name: str, column_name: str) -> bool:
-    bind = op.get_bind()
-    inspector = sa_inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
+def _column_exists(inspector: Inspector, table_name: str, column_name: str) -> bool:
+    return column_name in {col['name'] for col in inspector.get_columns(table_name)}
 
 
 def upgrade() -> None:
-    if not _column_exists('admin_llm_config', 'model_type'):
+    inspector = get_inspector(op.get_bind())
+    if not _column_exists(inspector, 'admin_llm_config', 'model_type'):
         op.add_column(
             'admin_llm_config',
             sa.Column('model_type', sa.String(128), nullable=True, server_default=''),
@@ -9,7 +9,8 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect as sa_inspect
+
+from app.component.alembic_helpers import get_inspector
 
 # revision identifiers, used by Alembic.
 revision: str = '2026_02_08_0001'
@@ -18,20 +19,19 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _column_exists(table_name: str, column_name: str) -> bool:
-    bind = op.get_bind()
-    inspector = sa_inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
+_PLAN_TABLES = ('execution_plan', 'plan_step', 'plan_step_log')
 
 
 def upgrade() -> None:
-    if not _column_exists('execution_plan', 'deleted_at'):
-        op.add_column('execution_plan', sa.Column('deleted_at', sa.DateTime(), nullable=True))
-    if not _column_exists('plan_step', 'deleted_at'):
-        op.add_column('plan_step', sa.Column('deleted_at', sa.DateTime(), nullable=True))
-    if not _column_exists('plan_step_log', 'deleted_at'):
-        op.add_column('plan_step_log', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # Reflect the columns of all three tables in one bulk query
+    inspector = get_inspector(op.get_bind())
+    columns = {
+        table_name: {col['name'] for col in table_columns}
+        for (_schema, table_name), table_columns in inspector.get_multi_columns(filter_names=_PLAN_TABLES).items()
+    }
+    for table_name in _PLAN_TABLES:
+        if 'deleted_at' not in columns.get(table_name, ()):
+            op.add_column(table_name, sa.Column('deleted_at', sa.DateTime(), nullable=True))
 
 
 def downgrade() -> None:
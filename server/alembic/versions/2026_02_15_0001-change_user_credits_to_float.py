@@ -20,25 +20,57 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+_BACKFILL_BATCH = 10_000
+
+
+def _swap_credits_column() -> None:
+    """Convert credits without rewriting "user" under an ACCESS EXCLUSIVE lock.
+
+    Adds credits_new, backfills it in id-range batches with one commit per
+    batch, then swaps it in. The swap holds a SHARE ROW EXCLUSIVE lock, which
+    blocks writes but not reads, while it catches up rows changed during the
+    backfill.
+    """
+    bind = op.get_bind()
+    op.add_column('user', sa.Column('credits_new', sa.Float(), server_default=sa.text("0"), nullable=True))
+    lo, hi = bind.execute(sa.text('SELECT min(id), max(id) FROM "user"')).one()
+    if lo is not None:
+        with op.get_context().autocommit_block():
+            for start in range(lo, hi + 1, _BACKFILL_BATCH):
+                op.execute(
+                    sa.text(
+                        'UPDATE "user" SET credits_new = credits WHERE id BETWEEN :lo AND :hi'
+                    ).bindparams(lo=start, hi=start + _BACKFILL_BATCH - 1)
+                )
+    op.execute('LOCK TABLE "user" IN SHARE ROW EXCLUSIVE MODE')
+    op.execute('UPDATE "user" SET credits_new = credits WHERE credits_new IS DISTINCT FROM credits')
+    op.execute('ALTER TABLE "user" DROP COLUMN credits')
+    op.execute('ALTER TABLE "user" RENAME COLUMN credits_new TO credits')
+
+
 def upgrade() -> None:
     # Alter the credits column from Integer to Float.
     # Existing integer values (0, 5, 10 …) are valid floats — no data loss.
-    op.alter_column(
-        'user',
-        'credits',
-        existing_type=sa.Integer(),
-        type_=sa.Float(),
-        existing_server_default=sa.text("0"),
-        existing_nullable=True,
-    )
+    if op.get_bind().dialect.name == 'postgresql':
+        _swap_credits_column()
+        return
+    # Batch mode so SQLite rebuilds "user" once; elsewhere it is a plain ALTER.
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column(
+            'credits',
+            existing_type=sa.Integer(),
+            type_=sa.Float(),
+            existing_server_default=sa.text("0"),
+            existing_nullable=True,
+        )
 
 
 def downgrade() -> None:
-    op.alter_column(
-        'user',
-        'credits',
-        existing_type=sa.Float(),
-        type_=sa.Integer(),
-        existing_server_default=sa.text("0"),
-        existing_nullable=True,
-    )
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column(
+            'credits',
+            existing_type=sa.Float(),
+            type_=sa.Integer(),
+            existing_server_default=sa.text("0"),
+            existing_nullable=True,
+        )
@@ -19,11 +19,28 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+_INVITE_CODE_INDEX = 'ux_user_invite_code'
+
+
 def upgrade() -> None:
+    # Add the column without inline UNIQUE, which would build the index under
+    # the ALTER TABLE lock, then build the unique index online. It is partial
+    # on PostgreSQL: most users never generate a code.
     op.add_column(
         'user',
-        sa.Column('invite_code', sa.String(32), nullable=True, unique=True),
+        sa.Column('invite_code', sa.String(32), nullable=True),
     )
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.execute(
+            f'ALTER TABLE `user` ADD UNIQUE INDEX {_INVITE_CODE_INDEX} (invite_code), ALGORITHM=INPLACE, LOCK=NONE'
+        )
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            _INVITE_CODE_INDEX, 'user', ['invite_code'], unique=True,
+            postgresql_where=sa.text('invite_code IS NOT NULL'), postgresql_concurrently=True,
+        )
 
 
 def downgrade() -> None:
@@ -17,6 +17,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.component.alembic_helpers import get_inspector
+
 
 # revision identifiers, used by Alembic.
 revision: str = "2026_02_16_0001"
@@ -25,36 +27,46 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _table_exists(conn, table_name: str) -> bool:
-    inspector = sa.inspect(conn)
-    return table_name in inspector.get_table_names()
+def _order_index_names(conn) -> set[str] | None:
+    """Names of the indexes on "order", or None when the table doesn't exist.
+
+    Reflects the table list and the index list once each for the whole run.
+    """
+    inspector = get_inspector(conn)
+    if "order" not in inspector.get_table_names():
+        return None
+    return {idx["name"] for idx in inspector.get_indexes("order")}
 
 
-def _index_exists(conn, table_name: str, index_name: str) -> bool:
-    inspector = sa.inspect(conn)
-    for idx in inspector.get_indexes(table_name):
-        if idx.get("name") == index_name:
-            return True
-    return False
+# "order" is a reserved word; building the probe in Core lets each dialect
+# quote it (double quotes on PostgreSQL, backticks on MySQL).
+_order = sa.table("order", sa.column("id"), sa.column("stripe_id"))
 
 
 def _has_duplicate_stripe_ids(conn) -> bool:
-    # "order" is a reserved keyword; rely on SQLAlchemy text and quoting.
-    # We only need to know if any duplicates exist.
-    sql = sa.text(
-        'SELECT stripe_id FROM "order" '
-        'WHERE stripe_id IS NOT NULL AND stripe_id <> \'\' '
-        'GROUP BY stripe_id HAVING COUNT(*) > 1 LIMIT 1'
+    # We only need to know if any duplicates exist, so probe with a semi-join
+    # that stops at the first duplicate pair instead of aggregating every
+    # stripe_id before the LIMIT applies.
+    o1, o2 = _order.alias("o1"), _order.alias("o2")
+    probe = (
+        sa.select(sa.literal(1))
+        .select_from(o1)
+        .where(
+            o1.c.stripe_id.isnot(None),
+            o1.c.stripe_id != "",
+            sa.exists().where(o2.c.stripe_id == o1.c.stripe_id, o2.c.id != o1.c.id),
+        )
+        .limit(1)
     )
-    row = conn.execute(sql).first()
-    return row is not None
+    return conn.execute(probe).first() is not None
 
 
 def upgrade() -> None:
     conn = op.get_bind()
+    index_names = _order_index_names(conn)
 
     # If the order table doesn't exist yet, create it.
-    if not _table_exists(conn, "order"):
+    if index_names is None:
         op.create_table(
             "order",
             sa.Column("deleted_at", sa.DateTime(), nullable=True),
@@ -79,36 +91,43 @@ def upgrade() -> None:
             sa.ForeignKeyConstraint(["plan_id"], ["plan.id"]),
         )
         op.create_index("ix_order_user_id", "order", ["user_id"], unique=False)
+        index_names = {"ix_order_user_id"}
 
     unique_index_name = "ux_order_stripe_id"
     non_unique_index_name = "ix_order_stripe_id"
 
     # If a unique index already exists, nothing to do.
-    if _index_exists(conn, "order", unique_index_name):
+    if unique_index_name in index_names:
         return
 
-    # If duplicates exist, create a non-unique index to at least speed up
-    # idempotency lookups without failing migration.
-    if _has_duplicate_stripe_ids(conn):
-        if not _index_exists(conn, "order", non_unique_index_name):
-            op.create_index(non_unique_index_name, "order", ["stripe_id"], unique=False)
-        return
+    # Build the index CONCURRENTLY outside the migration transaction, so
+    # Stripe fulfillment can keep writing to "order" while it builds.
+    has_duplicates = _has_duplicate_stripe_ids(conn)
+    with op.get_context().autocommit_block():
+        # If duplicates exist, create a non-unique index to at least speed up
+        # idempotency lookups without failing migration.
+        if has_duplicates:
+            if non_unique_index_name not in index_names:
+                op.create_index(
+                    non_unique_index_name, "order", ["stripe_id"], unique=False, postgresql_concurrently=True
+                )
+            return
 
-    # No duplicates: enforce uniqueness for true idempotency.
-    op.create_index(unique_index_name, "order", ["stripe_id"], unique=True)
+        # No duplicates: enforce uniqueness for true idempotency.
+        op.create_index(unique_index_name, "order", ["stripe_id"], unique=True, postgresql_concurrently=True)
 
 
 def downgrade() -> None:
-    conn = op.get_bind()
-
-    if not _table_exists(conn, "order"):
+    index_names = _order_index_names(op.get_bind())
+    if index_names is None:
         return
 
     unique_index_name = "ux_order_stripe_id"
     non_unique_index_name = "ix_order_stripe_id"
 
     # Drop whichever we created.
-    if _index_exists(conn, "order", unique_index_name):
-        op.drop_index(unique_index_name, table_name="order")
-    if _index_exists(conn, "order", non_unique_index_name):
-        op.drop_index(non_unique_index_name, table_name="order")
+    with op.get_context().autocommit_block():
+        if unique_index_name in index_names:
+            op.drop_index(unique_index_name, table_name="order", postgresql_concurrently=True)
+        if non_unique_index_name in index_names:
+            op.drop_index(non_unique_index_name, table_name="order", postgresql_concurrently=True)
@@ -11,13 +11,19 @@ to a Hanggent user.  This replaces the Telegram-only
 table for backward compatibility.
 
 Also migrates existing ``telegram_user_mapping`` rows into the new table.
+The channel_type/channel_user_id columns get no single-column indexes;
+uq_channel_identity covers them (see 2026_02_23_0014).
 """
 
+import os
+import time
 from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
 
+from app.component.alembic_helpers import get_inspector
+
 
 # revision identifiers, used by Alembic.
 revision: str = "2026_02_17_0001"
@@ -26,78 +32,137 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
-def _table_exists(conn, table_name: str) -> bool:
-    inspector = sa.inspect(conn)
-    return table_name in inspector.get_table_names()
+_COPY_BATCH = 1000
+_COPY_INDEX = "ix_telegram_user_mapping_live_id"
 
+_COPY_POSTGRESQL = """
+    INSERT INTO channel_user_mapping
+        (user_id, channel_type, channel_user_id, channel_username,
+         auto_registered, linked_at, created_at, updated_at)
+    SELECT
+        user_id,
+        'telegram',
+        telegram_chat_id::text,
+        telegram_username,
+        false,
+        linked_at,
+        created_at,
+        updated_at
+    FROM telegram_user_mapping
+    WHERE deleted_at IS NULL AND id > :lo AND id <= :hi
+    ON CONFLICT (channel_type, channel_user_id) DO NOTHING
+"""
 
-def upgrade() -> None:
-    conn = op.get_bind()
+_COPY_MYSQL = """
+    INSERT INTO channel_user_mapping
+        (user_id, channel_type, channel_user_id, channel_username,
+         auto_registered, linked_at, created_at, updated_at)
+    SELECT
+        t.user_id,
+        'telegram',
+        CAST(t.telegram_chat_id AS CHAR),
+        t.telegram_username,
+        0,
+        t.linked_at,
+        t.created_at,
+        t.updated_at
+    FROM telegram_user_mapping t
+    WHERE t.deleted_at IS NULL AND t.id > :lo AND t.id <= :hi
+      AND NOT EXISTS (
+          SELECT 1 FROM channel_user_mapping c
+          WHERE c.channel_type = 'telegram' AND c.channel_user_id = CAST(t.telegram_chat_id AS CHAR)
+      )
+"""
 
-    if not _table_exists(conn, "channel_user_mapping"):
-        op.create_table(
-            "channel_user_mapping",
-            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
-            sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False, index=True),
-            sa.Column("channel_type", sa.String(32), nullable=False, index=True),
-            sa.Column("channel_user_id", sa.String(128), nullable=False, index=True),
-            sa.Column("channel_username", sa.String(128), nullable=True),
-            sa.Column("channel_metadata", sa.JSON(), nullable=True),
-            sa.Column("auto_registered", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-            sa.Column("linked_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-            sa.Column("deleted_at", sa.DateTime(), nullable=True),
-            sa.Column("created_at", sa.TIMESTAMP(), nullable=True, server_default=sa.text("CURRENT_TIMESTAMP")),
-            sa.Column("updated_at", sa.TIMESTAMP(), nullable=True, server_default=sa.text("CURRENT_TIMESTAMP")),
-            sa.UniqueConstraint("channel_type", "channel_user_id", name="uq_channel_identity"),
-        )
+# (relax, restore) session settings for an opt-in faster copy. The copy is
+# idempotent, so on PostgreSQL batches don't wait for their WAL flush; a crash
+# loses at most the last few batches, which a rerun copies again. MySQL skips
+# the foreign key checks (rows come from a table with the same user FK) but
+# keeps unique_checks so uq_channel_identity stays enforced.
+_RELAXED_SESSION = {
+    "postgresql": ("SET synchronous_commit = off", "RESET synchronous_commit"),
+    "mysql": ("SET SESSION foreign_key_checks = 0", "SET SESSION foreign_key_checks = 1"),
+}
+
+# Upper id of the next batch of live rows after :lo
+_NEXT_BATCH = sa.text(
+    "SELECT MAX(id) FROM ("
+    "SELECT id FROM telegram_user_mapping WHERE deleted_at IS NULL AND id > :lo ORDER BY id LIMIT :n"
+    ") batch"
+)
+
+
+def _copy_telegram_mappings(conn) -> None:
+    """Copy live telegram_user_mapping rows in keyset-paginated batches, one commit per batch.
 
-    # Migrate existing telegram_user_mapping rows
-    if _table_exists(conn, "telegram_user_mapping") and _table_exists(conn, "channel_user_mapping"):
-        dialect = conn.dialect.name
-        if dialect == "postgresql":
-            conn.execute(
-                sa.text("""
-                    INSERT INTO channel_user_mapping
-                        (user_id, channel_type, channel_user_id, channel_username,
-                         auto_registered, linked_at, created_at, updated_at)
-                    SELECT
-                        user_id,
-                        'telegram',
-                        CAST(telegram_chat_id AS TEXT),
-                        telegram_username,
-                        false,
-                        linked_at,
-                        created_at,
-                        updated_at
-                    FROM telegram_user_mapping
-                    WHERE deleted_at IS NULL
-                    ON CONFLICT (channel_type, channel_user_id) DO UPDATE
-                        SET updated_at = EXCLUDED.updated_at
-                """)
+    A temporary index over the live rows' ids lets each batch seek straight
+    to its first row instead of rescanning the table. MIGRATION_SLEEP_MS
+    pauses between batches to throttle the copy, and
+    MIGRATION_RELAXED_DURABILITY=true relaxes the session for the copy (see
+    _RELAXED_SESSION).
+    """
+    postgresql = conn.dialect.name == "postgresql"
+    copy = sa.text(_COPY_POSTGRESQL if postgresql else _COPY_MYSQL)
+    pause = float(os.environ.get("MIGRATION_SLEEP_MS", "0")) / 1000
+    last_id = 0
+    with op.get_context().autocommit_block():
+        if postgresql:
+            op.create_index(
+                _COPY_INDEX, "telegram_user_mapping", ["id"], postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True, if_not_exists=True,
             )
         else:
-            conn.execute(
-                sa.text("""
-                    INSERT INTO channel_user_mapping
-                        (user_id, channel_type, channel_user_id, channel_username,
-                         auto_registered, linked_at, created_at, updated_at)
-                    SELECT
-                        user_id,
-                        'telegram',
-                        CAST(telegram_chat_id AS CHAR),
-                        telegram_username,
-                        0,
-                        linked_at,
-                        created_at,
-                        updated_at
-                    FROM telegram_user_mapping
-                    WHERE deleted_at IS NULL
-                    ON DUPLICATE KEY UPDATE updated_at = VALUES(updated_at)
-                """)
+            op.create_index(_COPY_INDEX, "telegram_user_mapping", ["deleted_at", "id"])
+        # Dialects without an entry (SQLite) copy at their default durability
+        session = _RELAXED_SESSION.get(conn.dialect.name)
+        relaxed = session is not None and os.environ.get("MIGRATION_RELAXED_DURABILITY", "").lower() in (
+            "true", "1", "yes"
+        )
+        if relaxed:
+            relax, restore = session
+            conn.execute(sa.text(relax))
+        try:
+            while True:
+                upper = conn.execute(_NEXT_BATCH, {"lo": last_id, "n": _COPY_BATCH}).scalar()
+                if upper is None:
+                    break
+                conn.execute(copy, {"lo": last_id, "hi": upper})
+                last_id = upper
+                if pause:
+                    time.sleep(pause)
+        finally:
+            if relaxed:
+                conn.execute(sa.text(restore))
+            op.drop_index(
+                _COPY_INDEX, table_name="telegram_user_mapping", postgresql_concurrently=True, if_exists=postgresql
             )
 
 
-def downgrade() -> None:
+def upgrade() -> None:
     conn = op.get_bind()
-    if _table_exists(conn, "channel_user_mapping"):
-        op.drop_table("channel_user_mapping")
+
+    op.create_table(
+        "channel_user_mapping",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("channel_type", sa.String(32), nullable=False),
+        sa.Column("channel_user_id", sa.String(128), nullable=False),
+        sa.Column("channel_username", sa.String(128), nullable=True),
+        sa.Column("channel_metadata", sa.JSON(), nullable=True),
+        sa.Column("auto_registered", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("linked_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=True, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.TIMESTAMP(), nullable=True, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.UniqueConstraint("channel_type", "channel_user_id", name="uq_channel_identity"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_channel_user_mapping_user_id", "channel_user_mapping", ["user_id"], if_not_exists=True)
+
+    # Migrate existing telegram_user_mapping rows; channel_user_mapping exists by now
+    if get_inspector(conn).has_table("telegram_user_mapping"):
+        _copy_telegram_mappings(conn)
+
+
+def downgrade() -> None:
+    op.drop_table("channel_user_mapping", if_exists=True)
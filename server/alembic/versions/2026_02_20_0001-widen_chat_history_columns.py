@@ -22,34 +22,51 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.alter_column(
-        "chat_history",
-        "project_name",
-        existing_type=sa.String(128),
-        type_=sa.String(512),
-        existing_nullable=True,
-    )
-    op.alter_column(
-        "chat_history",
-        "summary",
-        existing_type=sa.String(1024),
-        type_=sa.Text(),
-        existing_nullable=True,
-    )
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Widening a VARCHAR and VARCHAR -> TEXT are both binary-compatible,
+        # so PostgreSQL only updates the catalog; one ALTER TABLE takes the
+        # lock once for both columns.
+        op.execute(
+            "ALTER TABLE chat_history "
+            "ALTER COLUMN project_name TYPE VARCHAR(512), "
+            "ALTER COLUMN summary TYPE TEXT"
+        )
+        return
+    if dialect == "mysql":
+        # Widening within the same length-prefix size is done in place; the
+        # change to TEXT below still needs a table copy on MySQL.
+        op.execute(
+            "ALTER TABLE chat_history MODIFY COLUMN project_name VARCHAR(512) NULL, ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    # Batch mode so SQLite rebuilds chat_history once for both columns.
+    with op.batch_alter_table("chat_history") as batch_op:
+        if dialect != "mysql":
+            batch_op.alter_column(
+                "project_name",
+                existing_type=sa.String(128),
+                type_=sa.String(512),
+                existing_nullable=True,
+            )
+        batch_op.alter_column(
+            "summary",
+            existing_type=sa.String(1024),
+            type_=sa.Text(),
+            existing_nullable=True,
+        )
 
 
 def downgrade() -> None:
-    op.alter_column(
-        "chat_history",
-        "summary",
-        existing_type=sa.Text(),
-        type_=sa.String(1024),
-        existing_nullable=True,
-    )
-    op.alter_column(
-        "chat_history",
-        "project_name",
-        existing_type=sa.String(512),
-        type_=sa.String(128),
-        existing_nullable=True,
-    )
+    with op.batch_alter_table("chat_history") as batch_op:
+        batch_op.alter_column(
+            "summary",
+            existing_type=sa.Text(),
+            type_=sa.String(1024),
+            existing_nullable=True,
+        )
+        batch_op.alter_column(
+            "project_name",
+            existing_type=sa.String(512),
+            type_=sa.String(128),
+            existing_nullable=True,
+        )
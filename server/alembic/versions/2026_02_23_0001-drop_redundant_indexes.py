@@ -0,0 +1,59 @@
+"""Drop single-column indexes covered by composite indexes
+
+Revision ID: 2026_02_23_0001
+Revises: 2026_02_22_0001
+Create Date: 2026-02-23
+
+usage_record.user_id is the leading column of idx_usage_user_created and
+job_analysis.resume_id is the leading column of ix_job_analysis_resume_job,
+so their standalone indexes only add write amplification.  plan_step_log's
+step_index index is folded into a (plan_id, step_index) composite matching
+the plan step log lookups, which also covers ix_plan_step_log_plan_id.
+
+Check pg_stat_user_indexes.idx_scan for the dropped indexes before running
+this against a production database.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0001"
+down_revision: Union[str, None] = "2026_02_22_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, index name, columns)
+_REDUNDANT_INDEXES = [
+    ("usage_record", "ix_usage_record_user_id", ["user_id"]),
+    ("job_analysis", "ix_job_analysis_resume_id", ["resume_id"]),
+    ("plan_step_log", "ix_plan_step_log_plan_id", ["plan_id"]),
+    ("plan_step_log", "ix_plan_step_log_step_index", ["step_index"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_plan_step_log_plan_step",
+            "plan_step_log",
+            ["plan_id", "step_index"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for table, name, _ in _REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name, columns in _REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index(
+            "ix_plan_step_log_plan_step",
+            table_name="plan_step_log",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,68 @@
+"""Restrict composite lookup indexes to live rows
+
+Revision ID: 2026_02_23_0002
+Revises: 2026_02_23_0001
+Create Date: 2026-02-23
+
+Audit of the composite indexes against the queries that use them:
+
+- idx_usage_user_created (user_id, created_at): user equality, created_at
+  range/order.  Already equality-first, unchanged.
+- ix_user_usage_summary_billing_period (user_id, billing_year, billing_month):
+  unique, all-equality lookups and newest-month-first scans per user.
+  Already in the right order, unchanged.
+- idx_usage_task_agent (task_id, agent_name) and
+  ix_job_analysis_resume_job (resume_id, job_id): order is right (the id
+  with more distinct values leads), but every reader filters on
+  deleted_at IS NULL, so on PostgreSQL both are rebuilt as partial indexes
+  over live rows only.
+
+Each index is rebuilt CONCURRENTLY under a temporary name and swapped in, so
+the old index keeps serving reads until the new one is valid.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0002"
+down_revision: Union[str, None] = "2026_02_23_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, index name, columns)
+_INDEXES = [
+    ("usage_record", "idx_usage_task_agent", ["task_id", "agent_name"]),
+    ("job_analysis", "ix_job_analysis_resume_job", ["resume_id", "job_id"]),
+]
+
+_LIVE_ROWS = sa.text("deleted_at IS NULL")
+
+
+def _swap_index(table: str, name: str, columns: list[str], where) -> None:
+    """Rebuild an index CONCURRENTLY under a temporary name, then swap it in."""
+    tmp_name = f"{name}_new"
+    op.create_index(
+        tmp_name, table, columns, postgresql_where=where, postgresql_concurrently=True, if_not_exists=True
+    )
+    op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.execute(f"ALTER INDEX {tmp_name} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table, name, columns in _INDEXES:
+            _swap_index(table, name, columns, _LIVE_ROWS)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table, name, columns in _INDEXES:
+            _swap_index(table, name, columns, None)
@@ -0,0 +1,67 @@
+"""Restrict the hot per-user indexes to live rows
+
+Revision ID: 2026_02_23_0003
+Revises: 2026_02_23_0002
+Create Date: 2026-02-23
+
+Readers of usage_record, user_usage_summary, execution_plan and plan_step_log
+filter on deleted_at IS NULL, so tombstoned rows only bloat these b-trees.
+On PostgreSQL they are rebuilt as partial indexes over live rows.
+ix_user_usage_summary_billing_period stays unique, now among live rows.
+
+Other dialects keep the full indexes.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0003"
+down_revision: Union[str, None] = "2026_02_23_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, index name, columns, unique)
+_INDEXES = [
+    ("usage_record", "idx_usage_user_created", ["user_id", "created_at"], False),
+    ("user_usage_summary", "ix_user_usage_summary_billing_period", ["user_id", "billing_year", "billing_month"], True),
+    ("execution_plan", "ix_execution_plan_user_id", ["user_id"], False),
+    ("plan_step_log", "ix_plan_step_log_plan_step", ["plan_id", "step_index"], False),
+]
+
+_LIVE_ROWS = sa.text("deleted_at IS NULL")
+
+
+def _swap_index(table: str, name: str, columns: list[str], unique: bool, where) -> None:
+    """Rebuild an index CONCURRENTLY under a temporary name, then swap it in."""
+    tmp_name = f"{name}_new"
+    op.create_index(
+        tmp_name,
+        table,
+        columns,
+        unique=unique,
+        postgresql_where=where,
+        postgresql_concurrently=True,
+        if_not_exists=True,
+    )
+    op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.execute(f"ALTER INDEX {tmp_name} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table, name, columns, unique in _INDEXES:
+            _swap_index(table, name, columns, unique, _LIVE_ROWS)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table, name, columns, unique in _INDEXES:
+            _swap_index(table, name, columns, unique, None)
@@ -0,0 +1,47 @@
+"""Validate the subscription_plan NOT NULL check
+
+Revision ID: 2026_02_23_0004
+Revises: 2026_02_23_0003
+Create Date: 2026-02-23
+
+add_stripe_fields_to_user adds user.subscription_plan as nullable on
+PostgreSQL, backfills it and guards it with a NOT VALID check constraint.
+Validating that constraint only takes a SHARE UPDATE EXCLUSIVE lock, and once
+it is valid SET NOT NULL skips its own full-table scan, after which the check
+is redundant and dropped.
+
+Databases migrated before the split already have a NOT NULL column and no
+check constraint; they are left alone.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect as sa_inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0004"
+down_revision: Union[str, None] = "2026_02_23_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_SUBSCRIPTION_PLAN_NOT_NULL = "ck_user_subscription_plan_not_null"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    checks = {ck["name"] for ck in sa_inspect(bind).get_check_constraints("user")}
+    if _SUBSCRIPTION_PLAN_NOT_NULL not in checks:
+        return
+    op.execute(f'ALTER TABLE "user" VALIDATE CONSTRAINT {_SUBSCRIPTION_PLAN_NOT_NULL}')
+    op.alter_column("user", "subscription_plan", nullable=False)
+    op.drop_constraint(_SUBSCRIPTION_PLAN_NOT_NULL, "user", type_="check")
+
+
+def downgrade() -> None:
+    # subscription_plan was always meant to be NOT NULL; keeping the tighter
+    # column is equivalent to the validated check it replaced.
+    pass
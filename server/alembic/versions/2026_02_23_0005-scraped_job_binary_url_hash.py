@@ -0,0 +1,64 @@
+"""Store scraped_job.url_hash as a 16-byte binary digest
+
+Revision ID: 2026_02_23_0005
+Revises: 2026_02_23_0004
+Create Date: 2026-02-23
+
+url_hash is an MD5 digest kept as 32 hex characters.  Storing the raw 16
+bytes halves the key width of the unique dedup index.  The application still
+sees hex strings through app.type.hex_digest.HexDigest.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0005"
+down_revision: Union[str, None] = "2026_02_23_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _alter_converting_rows(type_, existing_type, convert) -> None:
+    """Change url_hash's type and rewrite every value client-side, for dialects without decode()/encode()."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, url_hash FROM scraped_job")).all()
+    with op.batch_alter_table("scraped_job") as batch_op:
+        batch_op.alter_column("url_hash", type_=type_, existing_type=existing_type, existing_nullable=False)
+    if rows:
+        bind.execute(
+            sa.text("UPDATE scraped_job SET url_hash = :url_hash WHERE id = :id").bindparams(
+                sa.bindparam("url_hash", type_=type_)
+            ),
+            [{"id": row.id, "url_hash": convert(row.url_hash)} for row in rows],
+        )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _alter_converting_rows(sa.LargeBinary(16), sa.String(32), bytes.fromhex)
+        return
+    op.alter_column(
+        "scraped_job",
+        "url_hash",
+        type_=sa.LargeBinary(16),
+        existing_type=sa.String(32),
+        existing_nullable=False,
+        postgresql_using="decode(url_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _alter_converting_rows(sa.String(32), sa.LargeBinary(16), bytes.hex)
+        return
+    op.alter_column(
+        "scraped_job",
+        "url_hash",
+        type_=sa.String(32),
+        existing_type=sa.LargeBinary(16),
+        existing_nullable=False,
+        postgresql_using="encode(url_hash, 'hex')",
+    )
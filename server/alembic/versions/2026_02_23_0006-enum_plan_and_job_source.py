@@ -0,0 +1,112 @@
+"""Store subscription_plan and scraped_job.source as PostgreSQL enums
+
+Revision ID: 2026_02_23_0006
+Revises: 2026_02_23_0005
+Create Date: 2026-02-23
+
+Both columns hold a small closed set of values (SubscriptionPlan and
+JobSource) that were stored as VARCHAR.  A native enum is a fixed 4 bytes per
+row and per index entry, and equality filters compare OIDs instead of strings.
+
+scraped_job.job_type and job_analysis.fit_level stay VARCHAR: their values
+come straight from JobSpy and the analysis agent and are not a closed set.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0006"
+down_revision: Union[str, None] = "2026_02_23_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+subscription_plan = postgresql.ENUM("free", "plus", "pro", name="subscription_plan")
+job_source = postgresql.ENUM("linkedin", "indeed", "glassdoor", "zip_recruiter", "google", name="job_source")
+
+
+def _check_values(table: str, column: str, enum: postgresql.ENUM) -> None:
+    """Normalize case and whitespace, then fail clearly if any value is outside the enum.
+
+    The cast below would otherwise abort with an opaque "invalid input value
+    for enum" error on the first row it can't convert.
+    """
+    op.execute(f'UPDATE "{table}" SET {column} = lower(btrim({column})) WHERE {column} <> lower(btrim({column}))')
+    unknown = (
+        op.get_bind()
+        .execute(
+            sa.text(f'SELECT DISTINCT {column} FROM "{table}" WHERE {column} NOT IN :values').bindparams(
+                sa.bindparam("values", expanding=True)
+            ),
+            {"values": list(enum.enums)},
+        )
+        .scalars()
+        .all()
+    )
+    if unknown:
+        raise RuntimeError(
+            f"{table}.{column} has values outside the {enum.name} enum: {', '.join(map(repr, sorted(unknown)))}. "
+            f"Update them to one of {', '.join(enum.enums)} and rerun the upgrade."
+        )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _check_values("user", "subscription_plan", subscription_plan)
+    _check_values("scraped_job", "source", job_source)
+
+    subscription_plan.create(op.get_bind(), checkfirst=True)
+    job_source.create(op.get_bind(), checkfirst=True)
+
+    # The VARCHAR default can't be cast automatically, so swap it around the type change
+    op.alter_column("user", "subscription_plan", server_default=None)
+    op.alter_column(
+        "user",
+        "subscription_plan",
+        type_=subscription_plan,
+        existing_type=sa.String(32),
+        existing_nullable=False,
+        postgresql_using="subscription_plan::subscription_plan",
+    )
+    op.alter_column("user", "subscription_plan", server_default="free")
+
+    op.alter_column(
+        "scraped_job",
+        "source",
+        type_=job_source,
+        existing_type=sa.String(50),
+        existing_nullable=False,
+        postgresql_using="source::job_source",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "scraped_job",
+        "source",
+        type_=sa.String(50),
+        existing_type=job_source,
+        existing_nullable=False,
+        postgresql_using="source::text",
+    )
+
+    op.alter_column("user", "subscription_plan", server_default=None)
+    op.alter_column(
+        "user",
+        "subscription_plan",
+        type_=sa.String(32),
+        existing_type=subscription_plan,
+        existing_nullable=False,
+        postgresql_using="subscription_plan::text",
+    )
+    op.alter_column("user", "subscription_plan", server_default="free")
+
+    job_source.drop(op.get_bind(), checkfirst=True)
+    subscription_plan.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,80 @@
+"""Rename usage_record.metadata to meta and store JSON columns as JSONB
+
+Revision ID: 2026_02_23_0007
+Revises: 2026_02_23_0006
+Create Date: 2026-02-23
+
+"metadata" collides with the declarative ``metadata`` attribute, which is why
+the model had to map it under another name.  The column is renamed to
+"meta".
+
+On PostgreSQL the usage and job hunt JSON columns move to JSONB, which is
+parsed once on write instead of on every read.  No GIN index is added:
+nothing queries into these documents yet.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0007"
+down_revision: Union[str, None] = "2026_02_23_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column): usage_record.meta and every JSON column of the job hunt
+# tables, which are loaded whole on the same list and detail paths
+_JSON_COLUMNS = [
+    ("usage_record", "meta"),
+    ("job_hunt_session", "search_criteria"),
+    ("job_hunt_session", "job_ids"),
+    ("job_hunt_session", "analysis_ids"),
+    ("job_hunt_session", "tailored_resume_ids"),
+    ("user_resume", "skills"),
+    ("user_resume", "experience"),
+    ("user_resume", "education"),
+    ("user_resume", "certifications"),
+    ("user_resume", "languages"),
+    ("scraped_job", "emails"),
+    ("scraped_job", "required_skills"),
+    ("scraped_job", "preferred_skills"),
+    ("job_analysis", "matching_skills"),
+    ("job_analysis", "missing_skills"),
+    ("job_analysis", "keyword_overlap"),
+    ("job_analysis", "strengths"),
+    ("job_analysis", "weaknesses"),
+    ("job_analysis", "recommendations"),
+    ("tailored_resume", "optimizations_made"),
+    ("tailored_resume", "keywords_added"),
+]
+
+
+def upgrade() -> None:
+    op.alter_column("usage_record", "metadata", new_column_name="meta")
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in _JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f"{column}::jsonb",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for table, column in _JSON_COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.JSON(),
+                existing_type=postgresql.JSONB(),
+                postgresql_using=f"{column}::json",
+            )
+    op.alter_column("usage_record", "meta", new_column_name="metadata")
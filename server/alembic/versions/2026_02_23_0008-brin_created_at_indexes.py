@@ -0,0 +1,48 @@
+"""Add BRIN indexes on created_at for the append-only tables
+
+Revision ID: 2026_02_23_0008
+Revises: 2026_02_23_0007
+Create Date: 2026-02-23
+
+usage_record, plan_step_log and scraped_job are append-only, so created_at
+follows physical row order.  A BRIN index answers time-range scans from a
+summary per block range: a few pages instead of a b-tree entry per row.
+Per-user time ranges keep using idx_usage_user_created.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0008"
+down_revision: Union[str, None] = "2026_02_23_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_TABLES = ["usage_record", "plan_step_log", "scraped_job"]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table in _TABLES:
+            op.create_index(
+                f"ix_{table}_created_at_brin",
+                table,
+                ["created_at"],
+                postgresql_using="brin",
+                postgresql_with={"pages_per_range": 32},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for table in _TABLES:
+            op.drop_index(f"ix_{table}_created_at_brin", table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,100 @@
+"""Widen high-growth ids to BIGINT and shrink small counters to SMALLINT
+
+Revision ID: 2026_02_23_0009
+Revises: 2026_02_23_0008
+Create Date: 2026-02-23
+
+usage_record, plan_step_log and scraped_job gain rows on every agent call,
+log line or scraped posting and will outgrow a 32-bit id.  Widening them now
+is cheaper than a forced rewrite later.  The same applies to the job_id
+columns that point at scraped_job.  Step indexes, counters and billing periods
+never leave SMALLINT range, which narrows the hot rows.
+
+Each table is rewritten once: all of its type changes go into a single
+ALTER TABLE.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0009"
+down_revision: Union[str, None] = "2026_02_23_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> [(column, new type, old type)]
+_RESIZED = {
+    "usage_record": [
+        ("id", sa.BigInteger(), sa.Integer()),
+        ("agent_step", sa.SmallInteger(), sa.Integer()),
+    ],
+    "plan_step_log": [
+        ("id", sa.BigInteger(), sa.Integer()),
+        ("log_index", sa.SmallInteger(), sa.Integer()),
+    ],
+    "scraped_job": [
+        ("id", sa.BigInteger(), sa.Integer()),
+        ("experience_years", sa.SmallInteger(), sa.Integer()),
+    ],
+    "job_analysis": [
+        ("job_id", sa.BigInteger(), sa.Integer()),
+    ],
+    "tailored_resume": [
+        ("job_id", sa.BigInteger(), sa.Integer()),
+    ],
+    "job_hunt_session": [
+        ("jobs_found_count", sa.SmallInteger(), sa.Integer()),
+        ("jobs_analyzed_count", sa.SmallInteger(), sa.Integer()),
+        ("jobs_tailored_count", sa.SmallInteger(), sa.Integer()),
+        ("auto_tailor_top_n", sa.SmallInteger(), sa.Integer()),
+    ],
+    "execution_plan": [
+        ("current_step_index", sa.SmallInteger(), sa.Integer()),
+        ("total_steps", sa.SmallInteger(), sa.Integer()),
+        ("completed_steps", sa.SmallInteger(), sa.Integer()),
+    ],
+    "user_usage_summary": [
+        ("billing_year", sa.SmallInteger(), sa.Integer()),
+        ("billing_month", sa.SmallInteger(), sa.Integer()),
+    ],
+}
+
+
+def _resize(to_new: bool) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # INTEGER is already 64-bit there, and an id declared BIGINT would
+        # stop aliasing the rowid and lose its autoincrement
+        return
+    if bind.dialect.name != "postgresql":
+        for table, columns in _RESIZED.items():
+            for column, new_type, old_type in columns:
+                op.alter_column(
+                    table, column,
+                    type_=new_type if to_new else old_type,
+                    existing_type=old_type if to_new else new_type,
+                )
+        return
+
+    for table, columns in _RESIZED.items():
+        clauses = ", ".join(
+            f"ALTER COLUMN {column} TYPE {(new_type if to_new else old_type).compile(dialect=bind.dialect)}"
+            for column, new_type, old_type in columns
+        )
+        op.execute(f"ALTER TABLE {table} {clauses}")
+        if any(column == "id" for column, _, _ in columns):
+            # SERIAL sequences are typed too; keep them in step with the column
+            seq_type = "bigint" if to_new else "integer"
+            op.execute(f"ALTER SEQUENCE IF EXISTS {table}_id_seq AS {seq_type}")
+
+
+def upgrade() -> None:
+    _resize(to_new=True)
+
+
+def downgrade() -> None:
+    _resize(to_new=False)
@@ -0,0 +1,82 @@
+"""Add foreign keys to the job hunt, usage and plan tables
+
+Revision ID: 2026_02_23_0010
+Revises: 2026_02_23_0009
+Create Date: 2026-02-23
+
+The id columns linking these tables were plain integers, so deleting a user,
+resume or plan left its dependants behind unless application code chased
+them down.  They become real foreign keys with ON DELETE CASCADE.
+scraped_job.session_id uses SET NULL instead, because scraped jobs are shared
+across sessions for deduplication, and usage_record.user_id uses RESTRICT:
+billing history is kept, and users are soft-deleted.
+
+On PostgreSQL the constraints are added NOT VALID: new writes are checked
+right away, and existing rows are not scanned under the ALTER TABLE lock.
+2026_02_23_0011 validates them.
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0010"
+down_revision: Union[str, None] = "2026_02_23_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referred table, referred column, on delete)
+_FOREIGN_KEYS = [
+    ("user_resume", "user_id", "user", "id", "CASCADE"),
+    ("job_hunt_session", "user_id", "user", "id", "CASCADE"),
+    ("job_hunt_session", "resume_id", "user_resume", "id", "CASCADE"),
+    ("scraped_job", "session_id", "job_hunt_session", "id", "SET NULL"),
+    ("job_analysis", "user_id", "user", "id", "CASCADE"),
+    ("job_analysis", "resume_id", "user_resume", "id", "CASCADE"),
+    ("job_analysis", "job_id", "scraped_job", "id", "CASCADE"),
+    ("tailored_resume", "user_id", "user", "id", "CASCADE"),
+    ("tailored_resume", "analysis_id", "job_analysis", "id", "CASCADE"),
+    ("tailored_resume", "original_resume_id", "user_resume", "id", "CASCADE"),
+    ("tailored_resume", "job_id", "scraped_job", "id", "CASCADE"),
+    ("usage_record", "user_id", "user", "id", "RESTRICT"),
+    ("execution_plan", "user_id", "user", "id", "CASCADE"),
+    ("plan_step", "plan_id", "execution_plan", "plan_id", "CASCADE"),
+    ("plan_step_log", "plan_id", "execution_plan", "id", "CASCADE"),
+]
+
+
+def _fk_name(table: str, column: str) -> str:
+    return f"fk_{table}_{column}"
+
+
+def _by_table(foreign_keys):
+    """Group the foreign keys by table, so SQLite copies each table once in batch mode."""
+    return groupby(foreign_keys, key=itemgetter(0))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for table, foreign_keys in _by_table(_FOREIGN_KEYS):
+            with op.batch_alter_table(table) as batch_op:
+                for _table, column, referred_table, referred_column, ondelete in foreign_keys:
+                    batch_op.create_foreign_key(
+                        _fk_name(table, column), referred_table, [column], [referred_column], ondelete=ondelete
+                    )
+        return
+    for table, column, referred_table, referred_column, ondelete in _FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT {_fk_name(table, column)} '
+            f'FOREIGN KEY ({column}) REFERENCES "{referred_table}" ({referred_column}) '
+            f"ON DELETE {ondelete} NOT VALID"
+        )
+
+
+def downgrade() -> None:
+    for table, foreign_keys in _by_table(reversed(_FOREIGN_KEYS)):
+        with op.batch_alter_table(table) as batch_op:
+            for _table, column, _referred_table, _referred_column, _ondelete in foreign_keys:
+                batch_op.drop_constraint(_fk_name(table, column), type_="foreignkey")
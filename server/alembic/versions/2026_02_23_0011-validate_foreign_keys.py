@@ -0,0 +1,82 @@
+"""Validate the foreign keys added NOT VALID in 2026_02_23_0010
+
+Revision ID: 2026_02_23_0011
+Revises: 2026_02_23_0010
+Create Date: 2026-02-23
+
+VALIDATE CONSTRAINT scans existing rows under SHARE UPDATE EXCLUSIVE, which
+does not block reads or writes on either table.  It runs in an autocommit
+block, so the ALTER TABLE locks taken by 2026_02_23_0010 are released first.
+
+Rows left pointing at a missing parent would make VALIDATE fail and stop
+every later upgrade.  For SET NULL keys the dangling reference is cleared;
+any other constraint with orphans is logged and left NOT VALID (it is still
+enforced for new writes) until the rows are cleaned up and it is validated
+by hand.
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0011"
+down_revision: Union[str, None] = "2026_02_23_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# (table, column, referred table, referred column, on delete), as in 2026_02_23_0010
+_FOREIGN_KEYS = [
+    ("user_resume", "user_id", "user", "id", "CASCADE"),
+    ("job_hunt_session", "user_id", "user", "id", "CASCADE"),
+    ("job_hunt_session", "resume_id", "user_resume", "id", "CASCADE"),
+    ("scraped_job", "session_id", "job_hunt_session", "id", "SET NULL"),
+    ("job_analysis", "user_id", "user", "id", "CASCADE"),
+    ("job_analysis", "resume_id", "user_resume", "id", "CASCADE"),
+    ("job_analysis", "job_id", "scraped_job", "id", "CASCADE"),
+    ("tailored_resume", "user_id", "user", "id", "CASCADE"),
+    ("tailored_resume", "analysis_id", "job_analysis", "id", "CASCADE"),
+    ("tailored_resume", "original_resume_id", "user_resume", "id", "CASCADE"),
+    ("tailored_resume", "job_id", "scraped_job", "id", "CASCADE"),
+    ("usage_record", "user_id", "user", "id", "RESTRICT"),
+    ("execution_plan", "user_id", "user", "id", "CASCADE"),
+    ("plan_step", "plan_id", "execution_plan", "plan_id", "CASCADE"),
+    ("plan_step_log", "plan_id", "execution_plan", "id", "CASCADE"),
+]
+
+
+def _orphans(table: str, column: str, referred_table: str, referred_column: str) -> str:
+    return (
+        f'FROM "{table}" c WHERE c.{column} IS NOT NULL AND NOT EXISTS '
+        f'(SELECT 1 FROM "{referred_table}" p WHERE p.{referred_column} = c.{column})'
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        for table, column, referred_table, referred_column, ondelete in _FOREIGN_KEYS:
+            name = f"fk_{table}_{column}"
+            orphans = _orphans(table, column, referred_table, referred_column)
+            if ondelete == "SET NULL":
+                conn.execute(sa.text(f'UPDATE "{table}" SET {column} = NULL WHERE id IN (SELECT c.id {orphans})'))
+            elif (count := conn.execute(sa.text(f"SELECT count(*) {orphans}")).scalar()):
+                logger.warning(
+                    "Leaving %s NOT VALID: %d %s rows reference a missing %s; delete or fix them, "
+                    'then run ALTER TABLE "%s" VALIDATE CONSTRAINT %s',
+                    name, count, table, referred_table, table, name,
+                )
+                continue
+            conn.execute(sa.text(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {name}'))
+
+
+def downgrade() -> None:
+    # A validated constraint has nothing to undo; 2026_02_23_0010 drops it.
+    pass
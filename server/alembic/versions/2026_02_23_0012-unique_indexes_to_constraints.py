@@ -0,0 +1,85 @@
+"""Turn the standalone unique indexes into unique constraints
+
+Revision ID: 2026_02_23_0012
+Revises: 2026_02_23_0011
+Create Date: 2026-02-23
+
+scraped_job.url_hash, user.clerk_id, user.stripe_customer_id and
+execution_plan.plan_id were made unique by separate CREATE UNIQUE INDEX
+statements.  They become named UNIQUE constraints, which is what the models
+declare.  On PostgreSQL, ADD CONSTRAINT ... USING INDEX adopts the existing
+index (renaming it to the constraint), so nothing is rebuilt.  The FK from
+plan_step to execution_plan.plan_id keeps pointing at the same index.
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0012"
+down_revision: Union[str, None] = "2026_02_23_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, index name, constraint name)
+_UNIQUE = [
+    ("scraped_job", "url_hash", "ix_scraped_job_url_hash", "uq_scraped_job_url_hash"),
+    ("user", "clerk_id", "ix_user_clerk_id", "uq_user_clerk_id"),
+    ("user", "stripe_customer_id", "ix_user_stripe_customer_id", "uq_user_stripe_customer_id"),
+    ("execution_plan", "plan_id", "ix_execution_plan_plan_id", "uq_execution_plan_plan_id"),
+]
+
+# Depends on the unique index over execution_plan.plan_id (see 2026_02_23_0010)
+_PLAN_STEP_FK = "fk_plan_step_plan_id"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for table, entries in groupby(_UNIQUE, key=itemgetter(0)):
+            with op.batch_alter_table(table) as batch_op:
+                for _table, column, index, constraint in entries:
+                    batch_op.create_unique_constraint(constraint, [column])
+                    batch_op.drop_index(index)
+        return
+
+    clauses: dict[str, list[str]] = {}
+    for table, _column, index, constraint in _UNIQUE:
+        clauses.setdefault(table, []).append(f"ADD CONSTRAINT {constraint} UNIQUE USING INDEX {index}")
+    for table, table_clauses in clauses.items():
+        op.execute(f'ALTER TABLE "{table}" {", ".join(table_clauses)}')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        with op.batch_alter_table("plan_step") as batch_op:
+            batch_op.drop_constraint(_PLAN_STEP_FK, type_="foreignkey")
+        for table, entries in groupby(reversed(_UNIQUE), key=itemgetter(0)):
+            with op.batch_alter_table(table) as batch_op:
+                for _table, column, index, constraint in entries:
+                    batch_op.create_index(index, [column], unique=True)
+                    batch_op.drop_constraint(constraint, type_="unique")
+        with op.batch_alter_table("plan_step") as batch_op:
+            batch_op.create_foreign_key(_PLAN_STEP_FK, "execution_plan", ["plan_id"], ["plan_id"], ondelete="CASCADE")
+        return
+
+    with op.get_context().autocommit_block():
+        for table, column, index, _constraint in _UNIQUE:
+            op.create_index(
+                index, table, [column], unique=True,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+    # The plan_step FK is bound to the constraint's index; re-create it so it
+    # binds to the plain unique index before the constraint goes away.
+    op.drop_constraint(_PLAN_STEP_FK, "plan_step", type_="foreignkey")
+    for table, _column, _index, constraint in reversed(_UNIQUE):
+        op.drop_constraint(constraint, table, type_="unique")
+    op.execute(
+        f"ALTER TABLE plan_step ADD CONSTRAINT {_PLAN_STEP_FK} "
+        "FOREIGN KEY (plan_id) REFERENCES execution_plan (plan_id) ON DELETE CASCADE NOT VALID"
+    )
+    op.execute(f"ALTER TABLE plan_step VALIDATE CONSTRAINT {_PLAN_STEP_FK}")
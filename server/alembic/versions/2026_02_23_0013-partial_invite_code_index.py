@@ -0,0 +1,48 @@
+"""Replace user.invite_code's unique constraint with a partial unique index
+
+Revision ID: 2026_02_23_0013
+Revises: 2026_02_23_0012
+Create Date: 2026-02-23
+
+2026_02_15_0002 now adds invite_code without inline UNIQUE and builds
+ux_user_invite_code (WHERE invite_code IS NOT NULL) concurrently.  Databases
+that ran the earlier version have the user_invite_code_key constraint
+instead; they get the same partial index and the constraint is dropped.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect as sa_inspect
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0013"
+down_revision: Union[str, None] = "2026_02_23_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_OLD_CONSTRAINT = "user_invite_code_key"
+_INDEX = "ux_user_invite_code"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    constraints = {uq["name"] for uq in sa_inspect(bind).get_unique_constraints("user")}
+    if _OLD_CONSTRAINT not in constraints:
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            _INDEX, "user", ["invite_code"], unique=True,
+            postgresql_where=sa.text("invite_code IS NOT NULL"), postgresql_concurrently=True, if_not_exists=True,
+        )
+    op.drop_constraint(_OLD_CONSTRAINT, "user", type_="unique")
+
+
+def downgrade() -> None:
+    # The partial index enforces the same uniqueness as the constraint it
+    # replaced; 2026_02_15_0002's downgrade drops it with the column.
+    pass
@@ -0,0 +1,44 @@
+"""Drop single-column indexes already covered by a unique constraint
+
+Revision ID: 2026_02_23_0014
+Revises: 2026_02_23_0013
+Create Date: 2026-02-23
+
+admin_llm_config, admin_model_pricing and channel_user_mapping were created
+with index=True on the columns of their unique constraints.  The unique index
+serves every lookup on its leading column, and nothing queries
+admin_model_pricing.model_name or channel_user_mapping.channel_user_id on its
+own, so these indexes only add work to each write.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2026_02_23_0014"
+down_revision: Union[str, None] = "2026_02_23_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, index name)
+_REDUNDANT = [
+    ("admin_llm_config", "provider_name", "ix_admin_llm_config_provider_name"),
+    ("admin_model_pricing", "provider_name", "ix_admin_model_pricing_provider_name"),
+    ("admin_model_pricing", "model_name", "ix_admin_model_pricing_model_name"),
+    ("channel_user_mapping", "channel_type", "ix_channel_user_mapping_channel_type"),
+    ("channel_user_mapping", "channel_user_id", "ix_channel_user_mapping_channel_user_id"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, _column, index in _REDUNDANT:
+            op.drop_index(index, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column, index in _REDUNDANT:
+            op.create_index(index, table, [column], postgresql_concurrently=True, if_not_exists=True)
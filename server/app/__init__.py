@@ -28,11 +28,42 @@ async def lifespan(app: FastAPI):
     # Startup: auto-start OpenClaw gateways for all configured users
     asyncio.create_task(_auto_start_openclaw())
     yield
+    # Shutdown: close shared HTTP clients
+    from app.component import backend_client, clerk_auth
+
+    await backend_client.aclose()
+    await clerk_auth.aclose()
+
+
+# Backoff between DB pings while waiting for the database at startup (~6.3s total)
+_DB_READY_DELAYS = (0.1, 0.2, 0.4, 0.8, 1.6, 3.2)
+
+
+def _ping_database() -> None:
+    from sqlalchemy import text
+
+    from app.component.database import engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _wait_for_database() -> bool:
+    """Return True once the database answers a ping, False if it never did."""
+    for delay in _DB_READY_DELAYS:
+        try:
+            await asyncio.to_thread(_ping_database)
+            return True
+        except Exception as e:
+            logger.debug("Database not ready, retrying in %.1fs: %s", delay, e)
+            await asyncio.sleep(delay)
+    return False
 
 
 async def _auto_start_openclaw():
     """Fire-and-forget: start all configured OpenClaw gateways after deploy."""
-    await asyncio.sleep(5)  # Wait for DB connections to stabilize
+    if not await _wait_for_database():
+        logger.warning("Database not ready after %.1fs, starting OpenClaw anyway", sum(_DB_READY_DELAYS))
     try:
         from app.service import openclaw_service
 
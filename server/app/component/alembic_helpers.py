@@ -0,0 +1,37 @@
+# ========= Copyright 2025-2026 @ Hanggent.AI All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Hanggent.AI All Rights Reserved. =========
+
+"""Shared helpers for Alembic revision scripts."""
+
+import weakref
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Inspector
+
+# One Inspector per migration connection; entries go away with the connection
+_inspectors: "weakref.WeakKeyDictionary[Connection, Inspector]" = weakref.WeakKeyDictionary()
+
+
+def get_inspector(bind: Connection) -> Inspector:
+    """Return the Inspector for ``bind``, shared by every revision run on it.
+
+    Reusing it keeps SQLAlchemy's reflection cache, so a table or column list
+    is fetched once per revision. env.py clears the cache after each revision;
+    within one, call ``clear_cache()`` before re-checking something the
+    revision itself just changed.
+    """
+    inspector = _inspectors.get(bind)
+    if inspector is None:
+        inspector = _inspectors[bind] = inspect(bind)
+    return inspector
@@ -6,7 +6,10 @@ Runs Alembic migrations to ensure the database schema is up to date.
 
 import os
 import sys
+import hashlib
 import pathlib
+import tempfile
+from typing import TYPE_CHECKING
 
 # Ensure project root is in path
 _project_root = pathlib.Path(__file__).parent.parent.parent
@@ -15,11 +18,120 @@ if str(_project_root) not in sys.path:
 
 from utils import traceroot_wrapper as traceroot
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
 logger = traceroot.get_logger("server_auto_migrate")
 
 # server/ directory — where alembic.ini and alembic/ live
 _server_dir = pathlib.Path(__file__).parent.parent.parent
 
+# Squashed baselines applied, in file name order, to empty databases instead
+# of the revisions they replace
+_squashed_dir = _server_dir / "alembic" / "squashed"
+
+# Head of the revision graph, read once per process
+_cached_head_rev: str | None = None
+
+# Head revision persisted across restarts as "<fingerprint> <head>", outside
+# the source tree; see _versions_fingerprint
+_versions_dir = _server_dir / "alembic" / "versions"
+_head_cache_file = pathlib.Path(tempfile.gettempdir()) / (
+    f"hanggent_alembic_head_{hashlib.sha256(str(_versions_dir).encode()).hexdigest()[:16]}"
+)
+
+
+def _get_engine() -> "Engine":
+    """Return the application's engine, so migrations don't open a pool of their own."""
+    from app.component.database import engine
+
+    return engine
+
+
+def _current_revision(engine: "Engine") -> str | None:
+    """Read the database's revision from alembic_version without importing Alembic."""
+    from sqlalchemy import inspect, text
+
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            return None
+        revisions = conn.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+    if len(revisions) > 1:
+        raise RuntimeError(f"Database has multiple heads: {', '.join(revisions)}")
+    return revisions[0] if revisions else None
+
+
+def _versions_fingerprint() -> str:
+    """Hash the name, size and mtime of every revision file in alembic/versions."""
+    digest = hashlib.sha256()
+    with os.scandir(_versions_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.endswith(".py"):
+                stat = entry.stat()
+                digest.update(f"{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_head_cache() -> str | None:
+    """Return the persisted head revision if no revision file changed since."""
+    try:
+        fingerprint, head = _head_cache_file.read_text().split()
+        if fingerprint == _versions_fingerprint():
+            return head
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _get_head_revision(alembic_cfg) -> str | None:
+    """Return the head revision, walking alembic/versions only when the cache is stale."""
+    global _cached_head_rev
+    if _cached_head_rev is None:
+        _cached_head_rev = _read_head_cache()
+    if _cached_head_rev is None:
+        from alembic.script import ScriptDirectory
+
+        _cached_head_rev = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+        try:
+            _head_cache_file.write_text(f"{_versions_fingerprint()} {_cached_head_rev}")
+        except OSError as e:
+            logger.debug(f"Could not persist head revision: {e}")
+    return _cached_head_rev
+
+
+def _load_squashed_baseline(path: pathlib.Path):
+    """Load a squashed baseline module by path (alembic/ is not a package)."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(f"squashed_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _apply_squashed_baselines(alembic_cfg, engine: "Engine", script) -> None:
+    """
+    Bring an empty database up through the squashed baselines.
+
+    For each baseline, upgrades to its parent revision as usual, then creates
+    everything the squashed revisions would in a single transaction and
+    stamps the database at the last of them. Later revisions are applied by
+    the regular upgrade.
+    """
+    from alembic import command
+    from alembic.operations import Operations
+    from alembic.runtime.migration import MigrationContext
+
+    for path in sorted(_squashed_dir.glob("*.py")):
+        baseline = _load_squashed_baseline(path)
+        command.upgrade(alembic_cfg, baseline.down_revision)
+        with engine.begin() as conn:
+            context = MigrationContext.configure(conn)
+            with Operations.context(context):
+                baseline.upgrade()
+            context.stamp(script, baseline.revision)
+        logger.info(f"Applied squashed baseline {path.name} (now at: {baseline.revision})")
+
 
 def run_migrations() -> bool:
     """
@@ -35,12 +147,6 @@ def run_migrations() -> bool:
         return True
 
     try:
-        from alembic.config import Config
-        from alembic import command
-        from alembic.script import ScriptDirectory
-        from alembic.runtime.migration import MigrationContext
-        from sqlalchemy import create_engine
-        
         from app.component.environment import env
         
         # Get database URL
@@ -49,6 +155,20 @@ def run_migrations() -> bool:
             logger.warning("No database_url configured, skipping auto-migration")
             return True
         
+        # Check current revision
+        engine = _get_engine()
+        current_rev = _current_revision(engine)
+        
+        # Up to date against the cached head: skip loading the rest of Alembic
+        if current_rev is not None and current_rev == (_cached_head_rev or _read_head_cache()):
+            logger.info(f"Database schema is up to date (revision: {current_rev})")
+            return True
+        
+        from alembic.config import Config
+        from alembic import command
+        from alembic.script import ScriptDirectory
+        from sqlalchemy import inspect
+        
         # Resolve alembic.ini from the server directory
         # __file__ = server/app/component/auto_migrate.py
         # _server_dir = server/  (3 levels up)
@@ -70,16 +190,8 @@ def run_migrations() -> bool:
             alembic_cfg.set_main_option("script_location", resolved)
             logger.debug(f"Resolved script_location: {script_location} -> {resolved}")
         
-        # Check current revision
-        engine = create_engine(database_url)
-        with engine.connect() as conn:
-            context = MigrationContext.configure(conn)
-            current_rev = context.get_current_revision()
-        engine.dispose()
-        
         # Get head revision
-        script = ScriptDirectory.from_config(alembic_cfg)
-        head_rev = script.get_current_head()
+        head_rev = _get_head_revision(alembic_cfg)
         
         if current_rev == head_rev:
             logger.info(f"Database schema is up to date (revision: {current_rev})")
@@ -89,13 +201,24 @@ def run_migrations() -> bool:
             f"Running database migrations: {current_rev or 'none'} -> {head_rev}"
         )
         
-        # Run upgrade
-        command.upgrade(alembic_cfg, "head")
-        
+        # Fresh installs skip the incremental revisions covered by the squashed baselines
+        apply_squashed = False
+        if current_rev is None and _squashed_dir.is_dir():
+            with engine.connect() as conn:
+                apply_squashed = not inspect(conn).get_table_names()
+
+        # Migrations run on a connection from the application's engine (see
+        # alembic/env.py) rather than on an engine of their own
+        with engine.connect() as conn:
+            alembic_cfg.attributes["connection"] = conn
+            if apply_squashed:
+                _apply_squashed_baselines(alembic_cfg, engine, ScriptDirectory.from_config(alembic_cfg))
+
+            # Run upgrade
+            command.upgrade(alembic_cfg, "head")
+
         # Verify the migration succeeded
-        with create_engine(database_url).connect() as conn:
-            context = MigrationContext.configure(conn)
-            new_rev = context.get_current_revision()
+        new_rev = _current_revision(engine)
         
         if new_rev == head_rev:
             logger.info(f"Database migrations completed successfully (now at: {head_rev})")
@@ -123,15 +246,14 @@ def check_critical_columns() -> dict:
     Useful for diagnosing migration issues.
     """
     try:
-        from sqlalchemy import create_engine, inspect
+        from sqlalchemy import inspect
         from app.component.environment import env
         
         database_url = env("database_url")
         if not database_url:
             return {"error": "No DATABASE_URL configured"}
         
-        engine = create_engine(database_url)
-        inspector = inspect(engine)
+        inspector = inspect(_get_engine())
         
         # Check user table columns
         user_columns = {col["name"] for col in inspector.get_columns("user")}
@@ -4,14 +4,27 @@ Auto-seed default admin LLM provider configurations on startup.
 Ensures DEFAULT_PROVIDERS entries exist in admin_llm_config with correct
 display_name, endpoint_url, and model_type without overwriting admin-set
 api_key or status.
+
+A hash of DEFAULT_PROVIDERS is kept in admin_settings once seeded; startups
+with an unchanged list skip the seed after that one lookup.
 """
 
+import hashlib
+import json
 import logging
 
 from sqlmodel import select
 
 logger = logging.getLogger("server_auto_seed")
 
+# admin_settings key holding the hash of the DEFAULT_PROVIDERS last seeded
+_SEED_MARKER_KEY = "default_providers_seed_hash"
+
+
+def _providers_hash(providers: list[dict]) -> str:
+    payload = json.dumps(providers, sort_keys=True).encode()
+    return hashlib.sha1(payload, usedforsecurity=False).hexdigest()[:16]
+
 
 def seed_default_providers() -> None:
     """Upsert DEFAULT_PROVIDERS into admin_llm_config.
@@ -19,9 +32,11 @@ def seed_default_providers() -> None:
     - Missing entries are created (status=enabled, empty api_key).
     - Existing entries get display_name, endpoint_url, and model_type updated
       ONLY if the current value is empty (preserves admin overrides).
+    - Skipped entirely when DEFAULT_PROVIDERS hasn't changed since the last seed.
     """
     try:
         from app.component.database import session_make
+        from app.model.admin.admin_settings import AdminSettings
         from app.model.admin.llm_config import (
             AdminLLMConfig,
             ConfigStatus,
@@ -30,15 +45,25 @@ def seed_default_providers() -> None:
 
         s = session_make()
         try:
-            created = 0
+            seed_hash = _providers_hash(DEFAULT_PROVIDERS)
+            if AdminSettings.get_value(s, _SEED_MARKER_KEY) == seed_hash:
+                logger.debug("Auto-seed: default providers unchanged since last seed")
+                return
+
             updated = 0
+            to_create: list[AdminLLMConfig] = []
+
+            # One query for all default providers instead of one per provider
+            names = [provider["provider_name"] for provider in DEFAULT_PROVIDERS]
+            existing_by_name = {
+                config.provider_name: config
+                for config in s.exec(
+                    select(AdminLLMConfig).where(AdminLLMConfig.provider_name.in_(names))
+                ).all()
+            }
 
             for provider in DEFAULT_PROVIDERS:
-                existing = s.exec(
-                    select(AdminLLMConfig).where(
-                        AdminLLMConfig.provider_name == provider["provider_name"]
-                    )
-                ).first()
+                existing = existing_by_name.get(provider["provider_name"])
 
                 if existing:
                     # Update fields that are empty — never overwrite admin customisations
@@ -62,7 +87,7 @@ def seed_default_providers() -> None:
                         s.add(existing)
                         updated += 1
                 else:
-                    config = AdminLLMConfig(
+                    to_create.append(AdminLLMConfig(
                         provider_name=provider["provider_name"],
                         display_name=provider.get("display_name", ""),
                         endpoint_url=provider.get("endpoint_url", ""),
@@ -70,16 +95,20 @@ def seed_default_providers() -> None:
                         api_key="",  # Must be configured by admin
                         status=ConfigStatus.enabled,
                         priority=0,
-                    )
-                    s.add(config)
-                    created += 1
+                    ))
 
+            # Added together so the flush sends the new rows as one batched INSERT
+            s.add_all(to_create)
+            created = len(to_create)
             s.commit()
+            AdminSettings.set_value(
+                s, _SEED_MARKER_KEY, seed_hash, "Hash of the default LLM providers last seeded at startup"
+            )
 
             if created or updated:
                 logger.info(
                     "Auto-seed default providers completed",
-                    extra={"created": created, "updated": updated},
+                    extra={"providers_created": created, "providers_updated": updated},
                 )
             else:
                 logger.debug("Auto-seed: all default providers already present")
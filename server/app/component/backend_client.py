@@ -13,6 +13,28 @@ logger = traceroot.get_logger("backend_client")
 BACKEND_URL = env("BACKEND_URL", "http://localhost:5001")
 _TIMEOUT = 30.0  # seconds – validation creates a real agent + live API call
 
+# Shared by all calls so connections to the Backend are pooled and kept alive;
+# closed by the app lifespan on shutdown
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared client (called on server shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def validate_model(
     model_platform: str,
@@ -41,7 +63,6 @@ async def validate_model(
         extra={"platform": model_platform, "model_type": model_type, "backend_url": BACKEND_URL},
     )
 
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.post(f"{BACKEND_URL}/model/validate", json=payload)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(f"{BACKEND_URL}/model/validate", json=payload)
+    resp.raise_for_status()
+    return resp.json()
@@ -6,10 +6,14 @@ using Clerk's JWKS endpoint for public key retrieval.
 """
 
 import asyncio
+import functools
 import logging
+import re
+import time
 import httpx
 import jwt
 from typing import Optional
+from urllib.parse import quote
 from pydantic import BaseModel
 from app.component.environment import env
 from app.exception.exception import UserException
@@ -17,6 +21,58 @@ from app.component import code
 
 logger = logging.getLogger(__name__)
 
+# Seconds the JWKS is served before it is refetched in the background
+_JWKS_TTL = 3600.0
+# An unknown kid refetches the JWKS at most this often, so tokens with made-up
+# kids can't turn every request into a fetch
+_JWKS_MIN_REFETCH_INTERVAL = 10.0
+# Clerk user IDs, as used in Backend API paths
+_CLERK_USER_ID_RE = re.compile(r"user_[A-Za-z0-9]+")
+
+# Shared Clerk Backend API client, so TLS and DNS are not redone per login;
+# closed by the app lifespan on shutdown
+_clerk_http: httpx.AsyncClient | None = None
+# Shared client for the (public) JWKS endpoint; it must not carry the secret key
+_jwks_http: httpx.AsyncClient | None = None
+
+
+def _get_clerk_http(secret_key: str) -> httpx.AsyncClient:
+    global _clerk_http
+    if _clerk_http is None:
+        _clerk_http = httpx.AsyncClient(
+            base_url="https://api.clerk.com",
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10),
+            headers={
+                "Authorization": f"Bearer {secret_key}",
+                "Content-Type": "application/json",
+            },
+        )
+    return _clerk_http
+
+
+def _get_jwks_http() -> httpx.AsyncClient:
+    global _jwks_http
+    if _jwks_http is None:
+        _jwks_http = httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_keepalive_connections=2))
+    return _jwks_http
+
+
+async def aclose() -> None:
+    """Close the shared Clerk clients (called on server shutdown)."""
+    global _clerk_http, _jwks_http
+    if _clerk_http is not None:
+        await _clerk_http.aclose()
+        _clerk_http = None
+    if _jwks_http is not None:
+        await _jwks_http.aclose()
+        _jwks_http = None
+
+
+def _log_jwks_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and (e := task.exception()) is not None:
+        logger.warning("Could not refresh Clerk JWKS", extra={"error": str(e)})
+
 
 class ClerkUserInfo(BaseModel):
     """Clerk user information extracted from JWT token."""
@@ -35,12 +91,17 @@ class ClerkAuth:
     Verifies Clerk session tokens by fetching public keys from Clerk's
     JWKS endpoint and validating JWT signatures.
     """
-    _signing_key_cache = {}
-    _jwks_client = None
+    # kid -> signing key, for every key in the last JWKS fetched
+    _signing_key_cache: dict[str, jwt.PyJWK] = {}
+    # time.monotonic() of the last successful JWKS fetch
+    _jwks_fetched_at: float | None = None
+    # JWKS fetch in flight, shared by every caller that needs it
+    _jwks_task: asyncio.Task | None = None
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def _get_clerk_domain() -> str:
-        """Get Clerk domain from environment or derive from publishable key."""
+        """Get Clerk domain from environment or derive from publishable key (resolved once)."""
         # Try explicit domain first
         clerk_domain = env("CLERK_DOMAIN")
         if clerk_domain:
@@ -74,6 +135,7 @@ class ClerkAuth:
         raise UserException(code.config_error, "CLERK_DOMAIN or CLERK_PUBLISHABLE_KEY not configured")
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def _get_jwks_url() -> str:
         """Get JWKS URL for Clerk."""
         domain = ClerkAuth._get_clerk_domain()
@@ -177,9 +239,12 @@ class ClerkAuth:
             raise UserException(code.token_invalid, f"Clerk token verification failed: {str(e)}")
 
     @staticmethod
-    async def _get_signing_key(kid: str):
+    async def _get_signing_key(kid: str) -> jwt.PyJWK:
         """
-        Get signing key from Clerk JWKS endpoint.
+        Get signing key for a key ID from the cached JWKS.
+
+        A JWKS older than _JWKS_TTL is still used while a background fetch
+        replaces it; only a kid missing from it waits on the network.
         
         Args:
             kid: Key ID from JWT header
@@ -187,28 +252,52 @@ class ClerkAuth:
         Returns:
             JWT signing key
         """
-        # Check cache first
-        if kid in ClerkAuth._signing_key_cache:
-            return ClerkAuth._signing_key_cache[kid]
+        fetched_at = ClerkAuth._jwks_fetched_at
+        signing_key = ClerkAuth._signing_key_cache.get(kid)
+        if signing_key is not None:
+            if time.monotonic() - fetched_at >= _JWKS_TTL:
+                ClerkAuth._refresh_jwks()
+            return signing_key
 
-        jwks_url = ClerkAuth._get_jwks_url()
-        loop = asyncio.get_running_loop()
-        
-        # Create JWKS client if not exists
-        if ClerkAuth._jwks_client is None:
-            ClerkAuth._jwks_client = jwt.PyJWKClient(jwks_url)
+        if fetched_at is None or time.monotonic() - fetched_at >= _JWKS_MIN_REFETCH_INTERVAL:
+            # Shielded: a cancelled request must not cancel the fetch other requests wait on
+            await asyncio.shield(ClerkAuth._refresh_jwks())
+            signing_key = ClerkAuth._signing_key_cache.get(kid)
+        if signing_key is None:
+            raise UserException(code.token_invalid, f"Failed to fetch Clerk signing key: unknown kid '{kid}'")
+        return signing_key
+
+    @staticmethod
+    def _refresh_jwks() -> asyncio.Task:
+        """Start a JWKS fetch unless one is already in flight, and return it."""
+        task = ClerkAuth._jwks_task
+        if task is None or task.done():
+            task = ClerkAuth._jwks_task = asyncio.create_task(ClerkAuth._fetch_jwks())
+            task.add_done_callback(_log_jwks_failure)
+        return task
 
+    @staticmethod
+    async def _fetch_jwks() -> None:
+        """Fetch Clerk's JWKS and replace the cached keys; on failure the old keys stay."""
         try:
-            signing_key = await loop.run_in_executor(
-                None, 
-                ClerkAuth._jwks_client.get_signing_key, 
-                kid
-            )
-            ClerkAuth._signing_key_cache[kid] = signing_key
-            return signing_key
-        except jwt.exceptions.PyJWKClientError as e:
+            response = await _get_jwks_http().get(ClerkAuth._get_jwks_url())
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError) as e:
             raise UserException(code.token_invalid, f"Failed to fetch Clerk signing key: {str(e)}")
 
+        signing_keys = {}
+        for jwk in jwks.get("keys", []):
+            kid = jwk.get("kid")
+            if not kid:
+                continue
+            try:
+                signing_keys[kid] = jwt.PyJWK.from_dict(jwk)
+            except jwt.PyJWKError as e:
+                logger.warning("Skipping unusable Clerk JWK", extra={"kid": kid, "error": str(e)})
+        ClerkAuth._signing_key_cache = signing_keys
+        ClerkAuth._jwks_fetched_at = time.monotonic()
+
     @staticmethod
     async def get_user_from_api(user_id: str) -> dict:
         """
@@ -234,48 +323,44 @@ class ClerkAuth:
                 "or add the email claim to your Clerk session token customization.",
             )
         
+        if not _CLERK_USER_ID_RE.fullmatch(user_id):
+            raise UserException(code.token_invalid, "Invalid Clerk user ID")
+
         # Clerk Backend API endpoint
-        url = f"https://api.clerk.com/v1/users/{user_id}"
-        headers = {
-            "Authorization": f"Bearer {secret_key}",
-            "Content-Type": "application/json",
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 401:
-                logger.error(
-                    "Clerk API returned 401 — CLERK_SECRET_KEY is invalid or does not match the Clerk instance",
-                    extra={"user_id": user_id, "status": 401},
-                )
-                raise UserException(
-                    code.config_error,
-                    "Failed to authenticate with Clerk API — CLERK_SECRET_KEY is invalid. "
-                    "Verify the key matches your Clerk instance in the Clerk Dashboard → API Keys.",
-                )
-            elif response.status_code == 403:
-                logger.error(
-                    "Clerk API returned 403 — CLERK_SECRET_KEY lacks permissions",
-                    extra={"user_id": user_id, "status": 403},
-                )
-                raise UserException(
-                    code.config_error,
-                    "Clerk API access forbidden — CLERK_SECRET_KEY may lack required permissions.",
-                )
-            elif response.status_code == 404:
-                raise UserException(code.user_not_found, f"Clerk user {user_id} not found")
-            else:
-                logger.error(
-                    "Clerk API returned unexpected status",
-                    extra={"user_id": user_id, "status": response.status_code, "body": response.text[:500]},
-                )
-                raise UserException(
-                    code.token_invalid, 
-                    f"Clerk API error: {response.status_code} - {response.text[:200]}"
-                )
+        response = await _get_clerk_http(secret_key).get(f"/v1/users/{quote(user_id, safe='')}")
+
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 401:
+            logger.error(
+                "Clerk API returned 401 — CLERK_SECRET_KEY is invalid or does not match the Clerk instance",
+                extra={"user_id": user_id, "status": 401},
+            )
+            raise UserException(
+                code.config_error,
+                "Failed to authenticate with Clerk API — CLERK_SECRET_KEY is invalid. "
+                "Verify the key matches your Clerk instance in the Clerk Dashboard → API Keys.",
+            )
+        elif response.status_code == 403:
+            logger.error(
+                "Clerk API returned 403 — CLERK_SECRET_KEY lacks permissions",
+                extra={"user_id": user_id, "status": 403},
+            )
+            raise UserException(
+                code.config_error,
+                "Clerk API access forbidden — CLERK_SECRET_KEY may lack required permissions.",
+            )
+        elif response.status_code == 404:
+            raise UserException(code.user_not_found, f"Clerk user {user_id} not found")
+        else:
+            logger.error(
+                "Clerk API returned unexpected status",
+                extra={"user_id": user_id, "status": response.status_code, "body": response.text[:500]},
+            )
+            raise UserException(
+                code.token_invalid, 
+                f"Clerk API error: {response.status_code} - {response.text[:200]}"
+            )
 
 
 def is_clerk_enabled() -> bool:
@@ -38,11 +38,29 @@ import json
 import logging
 import os
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
+
+try:
+    import orjson as _json_parser
+except ImportError:
+    _json_parser = json
 
 logger = logging.getLogger(__name__)
 
-_config: dict[str, Any] = {}
+_DEFAULT_WELCOME_MESSAGE = (
+    "👋 Welcome to Hanggent AI! I'm your personal AI assistant. Just send me a message and I'll help you out."
+)
+
+# Filled once by _load_config() and cleared by reload_config(); the helpers
+# below read these instead of walking the config on every call
+_loaded = False
+_EMPTY_PROXY: Mapping[str, Any] = MappingProxyType({})
+_config: Mapping[str, Any] = _EMPTY_PROXY
+_channel_proxies: dict[str, Mapping[str, Any]] = {}
+_settings: Mapping[str, Any] = _EMPTY_PROXY
+_enabled_channels: frozenset[str] = frozenset()
+_welcome_message: str = _DEFAULT_WELCOME_MESSAGE
 
 # Map env var → (channel, key)
 _ENV_OVERRIDES: list[tuple[str, str, str]] = [
@@ -63,49 +81,73 @@ _ENV_OVERRIDES: list[tuple[str, str, str]] = [
 ]
 
 
-def _load_config() -> dict[str, Any]:
-    """Load im-channels.json with env var overrides."""
-    global _config
-    if _config:
+def _read_env_overrides() -> list[tuple[str, str, str]]:
+    """(channel, key, value) for the override env vars that are set."""
+    return [(channel, key, val) for env_var, channel, key in _ENV_OVERRIDES if (val := os.getenv(env_var))]
+
+
+# Overrides whose env var is set, read at import; usually few or none
+_ACTIVE_OVERRIDES = _read_env_overrides()
+
+
+def refresh_env_overrides() -> None:
+    """Re-read the override env vars (applied on the next load)."""
+    global _ACTIVE_OVERRIDES
+    _ACTIVE_OVERRIDES = _read_env_overrides()
+
+
+def _load_config() -> Mapping[str, Any]:
+    """Load im-channels.json with env var overrides (once; see reload_config)."""
+    global _loaded, _config, _channel_proxies, _settings, _enabled_channels, _welcome_message
+    if _loaded:
         return _config
 
     config_path = Path(__file__).parent.parent.parent.parent / "config" / "im-channels.json"
     if config_path.exists():
-        with open(config_path) as f:
-            _config = json.load(f)
+        with open(config_path, "rb") as f:
+            config = _json_parser.loads(f.read())
         logger.info("Loaded IM channels config from %s", config_path)
     else:
         logger.warning("im-channels.json not found at %s — using defaults", config_path)
-        _config = {}
+        config = {}
 
     # Apply env var overrides
-    for env_var, channel, key in _ENV_OVERRIDES:
-        val = os.getenv(env_var)
-        if val:
-            _config.setdefault(channel, {})[key] = val
-
+    for channel, key, val in _ACTIVE_OVERRIDES:
+        config.setdefault(channel, {})[key] = val
+
+    # Each section is frozen too, so callers can't mutate the shared config
+    _channel_proxies = {k: MappingProxyType(v) for k, v in config.items() if isinstance(v, dict)}
+    _config = MappingProxyType({k: _channel_proxies.get(k, v) for k, v in config.items()})
+    _settings = _channel_proxies.get("settings", _EMPTY_PROXY)
+    _enabled_channels = frozenset(
+        name for name, ch in config.items() if isinstance(ch, dict) and ch.get("enabled", False)
+    )
+    _welcome_message = _settings.get("welcome_message", _DEFAULT_WELCOME_MESSAGE)
+    _loaded = True
     return _config
 
 
-def get_config() -> dict[str, Any]:
-    """Return the full config dict (loaded lazily)."""
+def get_config() -> Mapping[str, Any]:
+    """Return the full config (loaded lazily, read-only)."""
     return _load_config()
 
 
-def get_channel_config(channel_type: str) -> dict[str, Any]:
-    """Return config for a specific channel, or empty dict if not configured."""
-    return _load_config().get(channel_type, {})
+def get_channel_config(channel_type: str) -> Mapping[str, Any]:
+    """Return config for a specific channel (read-only), or an empty mapping if not configured."""
+    _load_config()
+    return _channel_proxies.get(channel_type, _EMPTY_PROXY)
 
 
 def is_channel_enabled(channel_type: str) -> bool:
     """Check if a channel is enabled in the config."""
-    ch = get_channel_config(channel_type)
-    return bool(ch.get("enabled", False))
+    _load_config()
+    return channel_type in _enabled_channels
 
 
-def get_settings() -> dict[str, Any]:
-    """Return the global ``settings`` block."""
-    return _load_config().get("settings", {})
+def get_settings() -> Mapping[str, Any]:
+    """Return the global ``settings`` block (read-only)."""
+    _load_config()
+    return _settings
 
 
 def is_auto_registration_enabled() -> bool:
@@ -115,14 +157,13 @@ def is_auto_registration_enabled() -> bool:
 
 def get_welcome_message() -> str:
     """Return the welcome message for newly auto-registered users."""
-    return get_settings().get(
-        "welcome_message",
-        "👋 Welcome to Hanggent AI! I'm your personal AI assistant. Just send me a message and I'll help you out.",
-    )
+    _load_config()
+    return _welcome_message
 
 
-def reload_config() -> dict[str, Any]:
-    """Force a config reload (e.g., after admin changes)."""
-    global _config
-    _config = {}
+def reload_config() -> Mapping[str, Any]:
+    """Force a config reload (e.g., after admin changes), re-reading env overrides."""
+    global _loaded
+    refresh_env_overrides()
+    _loaded = False
     return _load_config()
@@ -3,45 +3,54 @@ Stripe Configuration for Hanggent Payment System
 
 This module provides Stripe SDK initialization and payment plan configurations.
 """
+import functools
+import re
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from app.component.environment import env
 from utils import traceroot_wrapper as traceroot
 
 logger = traceroot.get_logger("stripe_config")
 
-try:
-    import stripe as _stripe
-except ModuleNotFoundError:  # pragma: no cover
-    _stripe = None
+
+@functools.lru_cache(maxsize=1)
+def _get_stripe():
+    """Import the Stripe SDK on first use (it is heavy); None if not installed."""
+    try:
+        import stripe
+    except ModuleNotFoundError:  # pragma: no cover
+        return None
+    return stripe
+
+
+# "sk_" and at least 13 more key characters, surrounding whitespace allowed
+_STRIPE_KEY_RE = re.compile(r"\s*sk_[A-Za-z0-9_]{13,}\s*")
 
 
 def _is_valid_stripe_secret_key(secret_key: Optional[str]) -> bool:
-    if not secret_key:
-        return False
-    key = secret_key.strip()
-    if not key:
-        return False
-    if not key.startswith("sk_"):
-        return False
-    return len(key) >= 16
+    return bool(secret_key and _STRIPE_KEY_RE.fullmatch(secret_key))
 
 
 # ============================================================================
 # Stripe API Configuration
 # ============================================================================
+# The STRIPE_* variables are read once per process; the getters below are hit
+# several times per payment request.
 
+@functools.lru_cache(maxsize=1)
 def get_stripe_secret_key() -> Optional[str]:
     """Get Stripe secret key from environment"""
     return env("STRIPE_SECRET_KEY")
 
 
+@functools.lru_cache(maxsize=1)
 def get_stripe_publishable_key() -> Optional[str]:
     """Get Stripe publishable key from environment"""
     return env("STRIPE_PUBLISHABLE_KEY")
 
 
+@functools.lru_cache(maxsize=1)
 def get_stripe_webhook_secret() -> Optional[str]:
     """Get Stripe webhook secret from environment"""
     return env("STRIPE_WEBHOOK_SECRET")
@@ -52,10 +61,6 @@ def init_stripe() -> bool:
     Initialize Stripe SDK with secret key.
     Returns True if Stripe is properly configured, False otherwise.
     """
-    if _stripe is None:
-        logger.warning("Stripe SDK not installed: `stripe` python package missing")
-        return False
-
     secret_key = get_stripe_secret_key()
     if not secret_key:
         logger.warning("Stripe not configured: STRIPE_SECRET_KEY is missing")
@@ -63,27 +68,39 @@ def init_stripe() -> bool:
     if not _is_valid_stripe_secret_key(secret_key):
         logger.warning("Stripe not configured: STRIPE_SECRET_KEY format is invalid")
         return False
+
+    stripe = _get_stripe()
+    if stripe is None:
+        logger.warning("Stripe SDK not installed: `stripe` python package missing")
+        return False
     
-    _stripe.api_key = secret_key.strip()
+    stripe.api_key = secret_key.strip()
     logger.info("Stripe SDK initialized successfully")
     return True
 
 
+@functools.lru_cache(maxsize=1)
 def is_stripe_enabled() -> bool:
     """Check if Stripe is enabled (has valid configuration)"""
-    return _stripe is not None and _is_valid_stripe_secret_key(get_stripe_secret_key())
+    return _is_valid_stripe_secret_key(get_stripe_secret_key()) and _get_stripe() is not None
 
 
 def get_stripe_module():
-    """Return the imported Stripe SDK module, or None if not installed."""
-    return _stripe
+    """Return the Stripe SDK module, or None if not installed."""
+    return _get_stripe()
 
 
 def require_stripe():
     """Return Stripe SDK module if available+configured, else raise."""
-    if not init_stripe() or _stripe is None:
+    if not init_stripe():
         raise RuntimeError("Stripe is not available or not configured")
-    return _stripe
+    return _get_stripe()
+
+
+def _model_family_pattern(model_ids) -> re.Pattern:
+    """Match model IDs starting with the first dash-separated segment of any of ``model_ids``."""
+    families = {model_id.split("-", 1)[0] for model_id in model_ids}
+    return re.compile("|".join(map(re.escape, sorted(families, key=len, reverse=True))))
 
 
 # ============================================================================
@@ -112,6 +129,13 @@ class PlanFeatures:
     has_trial: bool
     trial_days: int
     stripe_price_id_monthly: Optional[str]
+    # Derived from allowed_models for is_model_allowed
+    allowed_model_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    allowed_family_re: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.allowed_model_set = frozenset(self.allowed_models)
+        self.allowed_family_re = _model_family_pattern(self.allowed_models)
 
 
 # Model pricing per 1M tokens (input/output) - Updated Jan 2026
@@ -162,25 +186,41 @@ MODEL_TOKEN_PRICING: dict[str, tuple[float, float]] = {
 }
 
 
+# Pricing of the first listed model of each family ("gpt", "claude", ...), for
+# versioned or unlisted model IDs; a family matches any ID it is a prefix of
+_PREFIX_PRICING: dict[str, tuple[float, float]] = {}
+for _known_model, _pricing in MODEL_TOKEN_PRICING.items():
+    _PREFIX_PRICING.setdefault(_known_model.split("-", 1)[0], _pricing)
+del _known_model, _pricing
+_PREFIX_RE = _model_family_pattern(_PREFIX_PRICING)
+_DEFAULT_PRICING = MODEL_TOKEN_PRICING["gpt-4o-mini"]
+
+
 def get_model_pricing(model_id: str) -> tuple[float, float]:
     """Get token pricing for a model. Returns (input_per_1m, output_per_1m)."""
     # Try exact match first
-    if model_id in MODEL_TOKEN_PRICING:
-        return MODEL_TOKEN_PRICING[model_id]
+    pricing = MODEL_TOKEN_PRICING.get(model_id)
+    if pricing is not None:
+        return pricing
     # Try prefix match for versioned models
-    for known_model, pricing in MODEL_TOKEN_PRICING.items():
-        if model_id.startswith(known_model.split("-")[0]):
-            return pricing
+    match = _PREFIX_RE.match(model_id)
+    if match:
+        return _PREFIX_PRICING[match.group()]
     # Default to gpt-4o-mini pricing if unknown
-    return MODEL_TOKEN_PRICING["gpt-4o-mini"]
+    return _DEFAULT_PRICING
+
+
+@functools.lru_cache(maxsize=256)
+def _get_per_token_pricing(model_id: str) -> tuple[float, float]:
+    """(input, output) price of a single token for a model, in dollars."""
+    input_price, output_price = get_model_pricing(model_id)
+    return input_price / 1_000_000, output_price / 1_000_000
 
 
 def calculate_token_cost(model_id: str, input_tokens: int, output_tokens: int) -> float:
     """Calculate cost in dollars for token usage."""
-    input_price, output_price = get_model_pricing(model_id)
-    input_cost = (input_tokens / 1_000_000) * input_price
-    output_cost = (output_tokens / 1_000_000) * output_price
-    return input_cost + output_cost
+    input_price, output_price = _get_per_token_pricing(model_id)
+    return input_tokens * input_price + output_tokens * output_price
 
 
 # All available models for all plans
@@ -246,6 +286,14 @@ PLAN_CONFIGS: dict[SubscriptionPlan, PlanFeatures] = {
 }
 
 
+# Stripe price ID -> plan, for webhook lookups
+_PRICE_ID_TO_PLAN: dict[str, SubscriptionPlan] = {
+    config.stripe_price_id_monthly: plan
+    for plan, config in PLAN_CONFIGS.items()
+    if config.stripe_price_id_monthly
+}
+
+
 def get_plan_config(plan: SubscriptionPlan) -> PlanFeatures:
     """Get configuration for a specific plan"""
     return PLAN_CONFIGS[plan]
@@ -253,24 +301,19 @@ def get_plan_config(plan: SubscriptionPlan) -> PlanFeatures:
 
 def get_plan_by_price_id(price_id: str) -> Optional[SubscriptionPlan]:
     """Find plan by Stripe price ID"""
-    for plan, config in PLAN_CONFIGS.items():
-        if config.stripe_price_id_monthly == price_id:
-            return plan
-    return None
+    return _PRICE_ID_TO_PLAN.get(price_id)
 
 
 def is_model_allowed(plan: SubscriptionPlan, model_id: str) -> bool:
     """Check if a model is allowed for a given plan"""
     config = get_plan_config(plan)
     # Allow if model is in the list or if it starts with an allowed model name
-    return any(
-        model_id == allowed or model_id.startswith(allowed.split("-")[0])
-        for allowed in config.allowed_models
-    )
+    return model_id in config.allowed_model_set or config.allowed_family_re.match(model_id) is not None
 
 
+@functools.lru_cache(maxsize=1)
 def get_all_plans_info() -> list[dict]:
-    """Get all plans information for frontend display"""
+    """Get all plans information for frontend display (built once; shared, do not mutate)"""
     return [
         {
             "id": plan.value,
@@ -289,8 +332,9 @@ def get_all_plans_info() -> list[dict]:
     ]
 
 
+@functools.lru_cache(maxsize=1)
 def get_model_pricing_info() -> list[dict]:
-    """Get all model pricing for frontend display"""
+    """Get all model pricing for frontend display (built once; shared, do not mutate)"""
     return [
         {
             "model_id": model_id,
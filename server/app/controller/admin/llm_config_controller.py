@@ -3,6 +3,8 @@
 Provides endpoints for managing system-wide LLM provider configurations
 and model pricing. Only accessible by admin users.
 """
+import functools
+import logging
 from typing import List, Optional
 from decimal import Decimal
 from fastapi import Depends, HTTPException, APIRouter
@@ -38,7 +40,7 @@ router = APIRouter(prefix="/admin", tags=["Admin LLM Configuration"])
 _DEFAULT_ADMIN_EMAILS = ""
 _env_admin_emails = env("ADMIN_EMAILS") or ""
 _admin_email_candidates = ",".join([_DEFAULT_ADMIN_EMAILS, _env_admin_emails])
-ADMIN_EMAILS = [e.strip().lower() for e in _admin_email_candidates.split(",") if e.strip()]
+ADMIN_EMAILS = frozenset(e.strip().lower() for e in _admin_email_candidates.split(",") if e.strip())
 
 
 def check_admin(auth: Auth) -> bool:
@@ -47,18 +49,18 @@ def check_admin(auth: Auth) -> bool:
         user = auth.user
         user_email = getattr(user, 'email', None)
         user_plan = getattr(user, 'subscription_plan', None)
-        logger.info("Admin check", extra={
-            "user_id": getattr(user, 'id', None),
-            "user_email": user_email,
-            "user_plan": user_plan,
-            "admin_emails": ADMIN_EMAILS,
-        })
+        # Runs on every admin request; only build the record when it will be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Admin check", extra={
+                "user_id": getattr(user, 'id', None),
+                "user_email": user_email,
+                "user_plan": user_plan,
+                "admin_emails": sorted(ADMIN_EMAILS),
+            })
         if user_email and user_email.lower().strip() in ADMIN_EMAILS:
             return True
         # Also check for pro subscription as admin access
-        if user_plan == "pro":
-            return True
-        return False
+        return user_plan == "pro"
     except Exception as e:
         logger.error("Admin check failed with exception", extra={"error": str(e)}, exc_info=True)
         return False
@@ -68,11 +70,26 @@ def require_admin(auth: Auth = Depends(auth_must)) -> Auth:
     """Dependency that requires admin access."""
     if not check_admin(auth):
         user_email = getattr(auth, '_user', None) and getattr(auth._user, 'email', 'unknown')
-        logger.warning("Admin access denied", extra={"user_email": user_email, "admin_emails": ADMIN_EMAILS})
+        logger.warning("Admin access denied", extra={"user_email": user_email, "admin_emails": sorted(ADMIN_EMAILS)})
         raise HTTPException(status_code=403, detail=_("Admin access required"))
     return auth
 
 
+# Columns an admin LLM config create/update may set; the schema is fixed for the process
+_ADMIN_LLM_ALLOWED_FIELDS = frozenset(getattr(AdminLLMConfig, "model_fields", {}).keys())
+
+
+@functools.lru_cache(maxsize=128)
+def _normalize_google_endpoint(url: str | None) -> str | None:
+    """Point a bare Gemini API endpoint at its OpenAI-compatible path."""
+    if not url:
+        return url
+    stripped = str(url).strip().rstrip("/")
+    if stripped == "https://generativelanguage.googleapis.com":
+        return "https://generativelanguage.googleapis.com/v1beta/openai/"
+    return url
+
+
 def mask_api_key(api_key: str) -> str:
     """Mask API key showing only last 4 characters."""
     if len(api_key) <= 4:
@@ -169,17 +186,7 @@ async def create_llm_config(
     if config_in.api_key is None:
         raise HTTPException(status_code=400, detail="api_key is required")
 
-    def _normalize_google_endpoint(url: str | None) -> str | None:
-        if not url:
-            return url
-        stripped = str(url).strip().rstrip("/")
-        if stripped == "https://generativelanguage.googleapis.com":
-            return "https://generativelanguage.googleapis.com/v1beta/openai/"
-        return url
-
     try:
-        allowed_fields = set(getattr(AdminLLMConfig, "model_fields", {}).keys())
-
         # Check if provider already exists — upsert if so
         existing = session.exec(
             select(AdminLLMConfig).where(AdminLLMConfig.provider_name == config_in.provider_name)
@@ -191,7 +198,7 @@ async def create_llm_config(
                 update_data["endpoint_url"] = _normalize_google_endpoint(update_data.get("endpoint_url"))
 
             for key, value in update_data.items():
-                if allowed_fields and key not in allowed_fields:
+                if _ADMIN_LLM_ALLOWED_FIELDS and key not in _ADMIN_LLM_ALLOWED_FIELDS:
                     continue
                 setattr(existing, key, value)
             session.add(existing)
@@ -205,8 +212,8 @@ async def create_llm_config(
         if (create_data.get("provider_name") or "").lower() == "google":
             create_data["endpoint_url"] = _normalize_google_endpoint(create_data.get("endpoint_url"))
 
-        if allowed_fields:
-            create_data = {key: value for key, value in create_data.items() if key in allowed_fields}
+        if _ADMIN_LLM_ALLOWED_FIELDS:
+            create_data = {key: value for key, value in create_data.items() if key in _ADMIN_LLM_ALLOWED_FIELDS}
 
         config = AdminLLMConfig(**create_data)
         session.add(config)
@@ -250,18 +257,7 @@ async def update_llm_config(
     auth: Auth = Depends(require_admin),
 ):
     """Update an admin LLM provider configuration."""
-
-    def _normalize_google_endpoint(url: str | None) -> str | None:
-        if not url:
-            return url
-        stripped = str(url).strip().rstrip("/")
-        if stripped == "https://generativelanguage.googleapis.com":
-            return "https://generativelanguage.googleapis.com/v1beta/openai/"
-        return url
-
     try:
-        allowed_fields = set(getattr(AdminLLMConfig, "model_fields", {}).keys())
-
         config = session.get(AdminLLMConfig, config_id)
         if not config:
             raise HTTPException(status_code=404, detail=_("Configuration not found"))
@@ -272,7 +268,7 @@ async def update_llm_config(
             update_data["endpoint_url"] = _normalize_google_endpoint(update_data.get("endpoint_url"))
 
         for key, value in update_data.items():
-            if allowed_fields and key not in allowed_fields:
+            if _ADMIN_LLM_ALLOWED_FIELDS and key not in _ADMIN_LLM_ALLOWED_FIELDS:
                 continue
             setattr(config, key, value)
         
@@ -361,18 +357,10 @@ async def seed_default_configs(
 ):
     """Seed default provider configurations (without API keys)."""
     try:
-        created = 0
-        skipped = 0
-        
-        for provider in DEFAULT_PROVIDERS:
-            existing = session.exec(
-                select(AdminLLMConfig).where(AdminLLMConfig.provider_name == provider["provider_name"])
-            ).first()
-            if existing:
-                skipped += 1
-                continue
-            
-            config = AdminLLMConfig(
+        # One query for the providers already present, one batch insert for the rest
+        existing = set(session.exec(select(AdminLLMConfig.provider_name)).all())
+        to_create = [
+            AdminLLMConfig(
                 provider_name=provider["provider_name"],
                 display_name=provider["display_name"],
                 endpoint_url=provider["endpoint_url"],
@@ -380,11 +368,15 @@ async def seed_default_configs(
                 api_key="",  # Placeholder, must be configured
                 status=ConfigStatus.disabled,  # Disabled until API key is added
             )
-            session.add(config)
-            created += 1
-        
+            for provider in DEFAULT_PROVIDERS
+            if provider["provider_name"] not in existing
+        ]
+        created = len(to_create)
+        skipped = len(DEFAULT_PROVIDERS) - created
+
+        session.add_all(to_create)
         session.commit()
-        logger.info("Default LLM configs seeded", extra={"created": created, "skipped": skipped})
+        logger.info("Default LLM configs seeded", extra={"configs_created": created, "configs_skipped": skipped})
         return {"message": f"Created {created} configs, skipped {skipped} existing"}
     except (ProgrammingError, OperationalError, InternalError) as e:
         logger.error("Database schema error in seed_default_configs - migration may be pending", extra={"error": str(e)})
@@ -587,6 +587,7 @@ def get_step_logs(
         select(PlanStepLogModel)
         .where(PlanStepLogModel.plan_id == plan_db_id)
         .where(PlanStepLogModel.step_index == step_index)
+        .where(PlanStepLogModel.deleted_at.is_(None))
         .order_by(PlanStepLogModel.log_index)
     )
     
@@ -614,6 +615,7 @@ def get_log_full_output(
         select(PlanStepLogModel)
         .where(PlanStepLogModel.plan_id == plan_db_id)
         .where(PlanStepLogModel.step_index == step_index)
+        .where(PlanStepLogModel.deleted_at.is_(None))
         .where(PlanStepLogModel.log_index == log_index)
     )
     
@@ -649,6 +651,7 @@ def update_step_log(
         select(PlanStepLogModel)
         .where(PlanStepLogModel.plan_id == plan_db_id)
         .where(PlanStepLogModel.step_index == step_index)
+        .where(PlanStepLogModel.deleted_at.is_(None))
         .where(PlanStepLogModel.log_index == log_index)
     )
     
@@ -79,7 +79,7 @@ class UserResumeOut(BaseModel):
 class ScrapedJobCreate(BaseModel):
     """Schema for creating a scraped job."""
     session_id: int
-    url_hash: str
+    url_hash: str = Field(pattern=r"^[0-9a-f]{32}$")
     job_url: str
     site: str
     title: str
@@ -242,6 +242,53 @@ class SessionStatusUpdate(BaseModel):
     status: str = Field(..., description="pending, running, completed, failed, cancelled")
 
 
+# =============================================================================
+# Ownership Checks
+# =============================================================================
+
+def _require_resume(session: Session, resume_id: int, user_id: int) -> UserResume:
+    """Return the user's resume, or raise 404."""
+    resume = session.exec(
+        select(UserResume).where(
+            UserResume.id == resume_id,
+            UserResume.user_id == user_id,
+            UserResume.deleted_at.is_(None)
+        )
+    ).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
+
+
+def _require_job(session: Session, job_id: int, user_id: int) -> ScrapedJob:
+    """Return a job found in one of the user's sessions, or raise 404."""
+    job = session.exec(
+        select(ScrapedJob).join(JobHuntSession, JobHuntSession.id == ScrapedJob.session_id).where(
+            ScrapedJob.id == job_id,
+            ScrapedJob.deleted_at.is_(None),
+            JobHuntSession.user_id == user_id,
+            JobHuntSession.deleted_at.is_(None)
+        )
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _require_analysis(session: Session, analysis_id: int, user_id: int) -> JobAnalysis:
+    """Return the user's job analysis, or raise 404."""
+    analysis = session.exec(
+        select(JobAnalysis).where(
+            JobAnalysis.id == analysis_id,
+            JobAnalysis.user_id == user_id,
+            JobAnalysis.deleted_at.is_(None)
+        )
+    ).first()
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis
+
+
 # =============================================================================
 # User Resume Endpoints
 # =============================================================================
@@ -759,14 +806,16 @@ def create_analysis(
     if not hunt_session:
         raise HTTPException(status_code=403, detail="Access denied to this session")
     
-    analysis = JobAnalysis(**data.dict())
+    # The referenced rows must exist and be the user's (404 rather than a foreign key error)
+    _require_resume(session, data.resume_id, auth.user.id)
+    job = _require_job(session, data.job_id, auth.user.id)
+
+    analysis = JobAnalysis(**data.dict(), user_id=auth.user.id)
     analysis.save(session)
     
     # Mark job as analyzed
-    job = session.get(ScrapedJob, data.job_id)
-    if job:
-        job.is_analyzed = True
-        job.save(session)
+    job.is_analyzed = True
+    job.save(session)
     
     # Update session analysis count
     hunt_session.jobs_analyzed = hunt_session.jobs_analyzed + 1
@@ -862,7 +911,12 @@ def create_tailored_resume(
     if not hunt_session:
         raise HTTPException(status_code=403, detail="Access denied to this session")
     
-    tailored = TailoredResume(**data.dict())
+    # The referenced rows must exist and be the user's (404 rather than a foreign key error)
+    _require_resume(session, data.resume_id, auth.user.id)
+    _require_job(session, data.job_id, auth.user.id)
+    _require_analysis(session, data.analysis_id, auth.user.id)
+
+    tailored = TailoredResume(**data.dict(), user_id=auth.user.id, original_resume_id=data.resume_id)
     tailored.save(session)
     
     # Update session tailored count
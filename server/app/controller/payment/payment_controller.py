@@ -3,6 +3,7 @@ Stripe Payment Controller
 
 Handles checkout sessions, webhooks, customer portal, and subscription management.
 """
+import functools
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request, Header
 from pydantic import BaseModel
@@ -14,6 +15,7 @@ from app.component.auth import Auth, auth_must
 from app.component.database import session
 from app.component.stripe_config import (
     is_stripe_enabled,
+    get_stripe_module,
     require_stripe,
     get_stripe_publishable_key,
     get_stripe_webhook_secret,
@@ -29,19 +31,27 @@ from utils import traceroot_wrapper as traceroot
 
 logger = traceroot.get_logger("payment_controller")
 
-# Stripe error compatibility: SDK v3+ uses stripe.StripeError, older uses stripe.error.StripeError
-_stripe_module = None
-try:
-    import stripe as _stripe_module
-except ImportError:
-    pass
+# Stripe error compatibility: SDK v3+ uses stripe.StripeError, older uses stripe.error.StripeError.
+# Resolved on first use (an except clause is only evaluated once something raised),
+# so importing this router does not import the Stripe SDK.
+@functools.lru_cache(maxsize=1)
+def _stripe_error() -> type[Exception]:
+    stripe = get_stripe_module()
+    if stripe is None:
+        return Exception
+    return getattr(stripe, 'StripeError', None) or getattr(getattr(stripe, 'error', None), 'StripeError', Exception)
+
+
+@functools.lru_cache(maxsize=1)
+def _signature_verification_error() -> type[Exception]:
+    stripe = get_stripe_module()
+    if stripe is None:
+        return Exception
+    return (
+        getattr(stripe, 'SignatureVerificationError', None)
+        or getattr(getattr(stripe, 'error', None), 'SignatureVerificationError', Exception)
+    )
 
-if _stripe_module is not None:
-    _StripeError = getattr(_stripe_module, 'StripeError', None) or getattr(getattr(_stripe_module, 'error', None), 'StripeError', Exception)
-    _SignatureVerificationError = getattr(_stripe_module, 'SignatureVerificationError', None) or getattr(getattr(_stripe_module, 'error', None), 'SignatureVerificationError', Exception)
-else:
-    _StripeError = Exception
-    _SignatureVerificationError = Exception
 
 router = APIRouter(tags=["Payment"])
 
@@ -175,7 +185,7 @@ def get_subscription_status(auth: Auth = Depends(auth_must), db: Session = Depen
         try:
             subscription = stripe.Subscription.retrieve(user.stripe_subscription_id)
             cancel_at_period_end = subscription.cancel_at_period_end
-        except _StripeError as e:
+        except _stripe_error() as e:
             logger.warning("Failed to retrieve subscription from Stripe", extra={
                 "user_id": user.id,
                 "error": str(e)
@@ -231,7 +241,7 @@ def create_checkout_session(
                 cancel_scheduled = bool(getattr(current_sub, "cancel_at_period_end", False))
                 if cancel_scheduled or sub_status == "canceled":
                     is_still_active = False
-            except _StripeError:
+            except _stripe_error():
                 pass
         if is_still_active:
             raise HTTPException(
@@ -254,7 +264,7 @@ def create_checkout_session(
                 pro_already_cancelled = (
                     str(getattr(pro_subscription, "status", "")).lower() == "canceled"
                 )
-            except _StripeError as e:
+            except _stripe_error() as e:
                 logger.warning(
                     "Failed to verify Pro cancellation status for Plus checkout guard",
                     extra={
@@ -319,7 +329,7 @@ def create_checkout_session(
             checkout_url=checkout_session.url,
             session_id=checkout_session.id,
         )
-    except _StripeError as e:
+    except _stripe_error() as e:
         if (
             user.stripe_customer_id
             and "customer" in checkout_params
@@ -356,7 +366,7 @@ def create_checkout_session(
                     checkout_url=checkout_session.url,
                     session_id=checkout_session.id,
                 )
-            except _StripeError as retry_err:
+            except _stripe_error() as retry_err:
                 e = retry_err
 
         error_msg = _stripe_error_message(e)
@@ -459,7 +469,7 @@ def create_topup_checkout(
             checkout_url=checkout_session.url,
             session_id=checkout_session.id,
         )
-    except _StripeError as e:
+    except _stripe_error() as e:
         if (
             user.stripe_customer_id
             and "customer" in checkout_params
@@ -496,7 +506,7 @@ def create_topup_checkout(
                     checkout_url=checkout_session.url,
                     session_id=checkout_session.id,
                 )
-            except _StripeError as retry_err:
+            except _stripe_error() as retry_err:
                 e = retry_err
 
         error_msg = _stripe_error_message(e)
@@ -551,7 +561,7 @@ def verify_checkout_session(
             cs = cs_obj
         else:
             cs = dict(cs_obj)
-    except _StripeError as e:
+    except _stripe_error() as e:
         logger.warning("verify-session: failed to retrieve session", extra={
             "session_id": request.session_id, "error": _stripe_error_message(e),
         })
@@ -623,7 +633,7 @@ def create_portal_session(
     if not user.stripe_customer_id:
         try:
             matches = stripe.Customer.list(email=user.email, limit=10)
-        except _StripeError as e:
+        except _stripe_error() as e:
             error_msg = str(e)
             logger.error("Failed to lookup Stripe customer by email", extra={
                 "user_id": user.id,
@@ -696,7 +706,7 @@ def create_portal_session(
             "customer_id": user.stripe_customer_id
         })
         return PortalSessionResponse(portal_url=portal_session.url)
-    except _StripeError as e:
+    except _stripe_error() as e:
         logger.error("Failed to create portal session", extra={
             "user_id": user.id,
             "error": str(e)
@@ -729,7 +739,7 @@ def cancel_subscription(auth: Auth = Depends(auth_must), db: Session = Depends(s
             "cancel_at": subscription.cancel_at
         })
         return {"message": "Subscription will be canceled at period end", "cancel_at": subscription.cancel_at}
-    except _StripeError as e:
+    except _stripe_error() as e:
         logger.error("Failed to cancel subscription", extra={
             "user_id": user.id,
             "error": str(e)
@@ -760,7 +770,7 @@ def resume_subscription(auth: Auth = Depends(auth_must), db: Session = Depends(s
             "subscription_id": user.stripe_subscription_id
         })
         return {"message": "Subscription resumed successfully"}
-    except _StripeError as e:
+    except _stripe_error() as e:
         logger.error("Failed to resume subscription", extra={
             "user_id": user.id,
             "error": str(e)
@@ -799,7 +809,7 @@ async def handle_webhook(
     except ValueError:
         logger.warning("Invalid webhook payload")
         raise HTTPException(status_code=400, detail="Invalid payload")
-    except _SignatureVerificationError:
+    except _signature_verification_error():
         logger.warning("Invalid webhook signature")
         raise HTTPException(status_code=400, detail="Invalid signature")
     
@@ -35,7 +35,7 @@ class AdminLLMConfig(AbstractModel, DefaultTimes, table=True):
     )
     
     id: int = Field(default=None, primary_key=True)
-    provider_name: str = Field(sa_column=Column(String(64), nullable=False, index=True))
+    provider_name: str = Field(sa_column=Column(String(64), nullable=False))
     display_name: str = Field(default="", sa_column=Column(String(128)))
     api_key: str = Field(sa_column=Column(Text, nullable=False))
     endpoint_url: str = Field(default="", sa_column=Column(String(512)))
@@ -115,8 +115,8 @@ class AdminModelPricing(AbstractModel, DefaultTimes, table=True):
     )
     
     id: int = Field(default=None, primary_key=True)
-    provider_name: str = Field(sa_column=Column(String(64), nullable=False, index=True))
-    model_name: str = Field(sa_column=Column(String(128), nullable=False, index=True))
+    provider_name: str = Field(sa_column=Column(String(64), nullable=False))
+    model_name: str = Field(sa_column=Column(String(128), nullable=False))
     display_name: str = Field(default="", sa_column=Column(String(256)))
     # Pricing per million tokens (stored as Decimal for precision)
     input_price_per_million: Decimal = Field(
@@ -1,4 +1,5 @@
-from sqlalchemy import Text, Float
+from sqlalchemy import BigInteger, Text, Float, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Column, JSON, String
 from typing import Optional, List
 from app.model.abstract.model import AbstractModel, DefaultTimes
@@ -15,9 +16,17 @@ class JobAnalysis(AbstractModel, DefaultTimes, table=True):
     id: int = Field(default=None, primary_key=True)
     
     # Foreign keys
-    resume_id: int = Field(index=True)
-    job_id: int = Field(index=True)
-    user_id: int = Field(index=True)
+    resume_id: int = Field(  # covered by ix_job_analysis_resume_job
+        sa_column_args=[ForeignKey("user_resume.id", name="fk_job_analysis_resume_id", ondelete="CASCADE")]
+    )
+    job_id: int = Field(
+        index=True,
+        sa_type=BigInteger,
+        sa_column_args=[ForeignKey("scraped_job.id", name="fk_job_analysis_job_id", ondelete="CASCADE")],
+    )
+    user_id: int = Field(
+        index=True, sa_column_args=[ForeignKey("user.id", name="fk_job_analysis_user_id", ondelete="CASCADE")]
+    )
     
     # Scores (0-100)
     overall_score: float = Field(sa_column=Column(Float))
@@ -27,14 +36,14 @@ class JobAnalysis(AbstractModel, DefaultTimes, table=True):
     keyword_match_score: float = Field(default=0, sa_column=Column(Float))  # 15% weight
     
     # Match details
-    matching_skills: List[str] = Field(default=[], sa_column=Column(JSON))
-    missing_skills: List[str] = Field(default=[], sa_column=Column(JSON))
-    keyword_overlap: List[str] = Field(default=[], sa_column=Column(JSON))
+    matching_skills: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    missing_skills: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    keyword_overlap: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Qualitative analysis
-    strengths: List[str] = Field(default=[], sa_column=Column(JSON))
-    weaknesses: List[str] = Field(default=[], sa_column=Column(JSON))
-    recommendations: List[str] = Field(default=[], sa_column=Column(JSON))
+    strengths: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    weaknesses: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    recommendations: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Fit assessment
     fit_level: str = Field(default="", sa_column=Column(String(50)))  # excellent, good, fair, poor
@@ -43,6 +52,10 @@ class JobAnalysis(AbstractModel, DefaultTimes, table=True):
     # Full analysis report (markdown)
     analysis_report: str = Field(default="", sa_column=Column(Text))
 
+    __table_args__ = (
+        Index('ix_job_analysis_resume_job', 'resume_id', 'job_id', postgresql_where=text('deleted_at IS NULL')),
+    )
+
 
 class JobAnalysisIn(BaseModel):
     resume_id: int
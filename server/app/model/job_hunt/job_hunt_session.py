@@ -1,4 +1,6 @@
-from sqlmodel import Field, Column, JSON, String
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, Column, JSON, SmallInteger, String
 from typing import Optional, List
 from enum import IntEnum
 from app.model.abstract.model import AbstractModel, DefaultTimes
@@ -25,15 +27,20 @@ class JobHuntSession(AbstractModel, DefaultTimes, table=True):
     id: int = Field(default=None, primary_key=True)
     
     # User and project context
-    user_id: int = Field(index=True)
+    user_id: int = Field(
+        index=True, sa_column_args=[ForeignKey("user.id", name="fk_job_hunt_session_user_id", ondelete="CASCADE")]
+    )
     project_id: str = Field(sa_column=Column(String(64), index=True))
     task_id: str = Field(sa_column=Column(String(64), index=True))
     
     # Resume being used
-    resume_id: int = Field(index=True)
+    resume_id: int = Field(
+        index=True,
+        sa_column_args=[ForeignKey("user_resume.id", name="fk_job_hunt_session_resume_id", ondelete="CASCADE")],
+    )
     
     # Search criteria
-    search_criteria: dict = Field(default={}, sa_column=Column(JSON))
+    search_criteria: dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     # Example: {
     #   "search_terms": ["software engineer", "python developer"],
     #   "locations": ["San Francisco, CA", "Remote"],
@@ -48,18 +55,18 @@ class JobHuntSession(AbstractModel, DefaultTimes, table=True):
     status_message: str = Field(default="", sa_column=Column(String(500)))
     
     # Results
-    jobs_found_count: int = Field(default=0)
-    jobs_analyzed_count: int = Field(default=0)
-    jobs_tailored_count: int = Field(default=0)
+    jobs_found_count: int = Field(default=0, sa_type=SmallInteger)
+    jobs_analyzed_count: int = Field(default=0, sa_type=SmallInteger)
+    jobs_tailored_count: int = Field(default=0, sa_type=SmallInteger)
     
     # IDs of related records (for quick lookup)
-    job_ids: List[int] = Field(default=[], sa_column=Column(JSON))
-    analysis_ids: List[int] = Field(default=[], sa_column=Column(JSON))
-    tailored_resume_ids: List[int] = Field(default=[], sa_column=Column(JSON))
+    job_ids: List[int] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    analysis_ids: List[int] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    tailored_resume_ids: List[int] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Configuration
     auto_analyze: bool = Field(default=True)  # Automatically analyze found jobs
-    auto_tailor_top_n: int = Field(default=3)  # Auto-tailor top N matches
+    auto_tailor_top_n: int = Field(default=3, sa_type=SmallInteger)  # Auto-tailor top N matches
     min_score_threshold: float = Field(default=60.0)  # Minimum score to consider for tailoring
 
 
@@ -1,9 +1,11 @@
-from sqlalchemy import Text, Float
+from sqlalchemy import BigInteger, Enum as SAEnum, ForeignKey, Index, SmallInteger, Text, Float, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Column, JSON, String
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 from app.model.abstract.model import AbstractModel, DefaultTimes
+from app.type.hex_digest import HexDigest
 from pydantic import BaseModel
 
 
@@ -24,13 +26,17 @@ class ScrapedJob(AbstractModel, DefaultTimes, table=True):
     Jobs are deduplicated globally - if the same job_url is found again,
     it won't create a new record.
     """
-    id: int = Field(default=None, primary_key=True)
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     
-    # Deduplication key - MD5 hash of job_url
-    url_hash: str = Field(sa_column=Column(String(32), index=True, unique=True))
+    # Deduplication key - MD5 hash of job_url, hex in Python, 16 raw bytes in the DB
+    url_hash: str = Field(sa_column=Column(HexDigest(16)))
     
     # Session tracking (which search found this job)
-    session_id: int = Field(index=True, nullable=True)
+    session_id: int = Field(
+        index=True,
+        nullable=True,
+        sa_column_args=[ForeignKey("job_hunt_session.id", name="fk_scraped_job_session_id", ondelete="SET NULL")],
+    )
     
     # Core job info
     title: str = Field(sa_column=Column(String(500)))
@@ -40,7 +46,7 @@ class ScrapedJob(AbstractModel, DefaultTimes, table=True):
     job_url_direct: str = Field(default="", sa_column=Column(String(1000)))  # Direct apply link
     
     # Source info
-    source: str = Field(sa_column=Column(String(50)))  # JobSource enum value
+    source: str = Field(sa_column=Column(SAEnum(*(s.value for s in JobSource), name="job_source")))
     
     # Job details
     description: str = Field(default="", sa_column=Column(Text))
@@ -59,14 +65,22 @@ class ScrapedJob(AbstractModel, DefaultTimes, table=True):
     # Additional metadata
     company_url: str = Field(default="", sa_column=Column(String(500)))
     company_logo: str = Field(default="", sa_column=Column(String(500)))
-    emails: List[str] = Field(default=[], sa_column=Column(JSON))
+    emails: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Extracted requirements (populated by analyzer agent)
-    required_skills: List[str] = Field(default=[], sa_column=Column(JSON))
-    preferred_skills: List[str] = Field(default=[], sa_column=Column(JSON))
-    experience_years: Optional[int] = Field(default=None)
+    required_skills: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    preferred_skills: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    experience_years: Optional[int] = Field(default=None, sa_type=SmallInteger)
     education_requirement: str = Field(default="", sa_column=Column(String(255)))
 
+    __table_args__ = (
+        UniqueConstraint('url_hash', name='uq_scraped_job_url_hash'),
+        Index(
+            'ix_scraped_job_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32},
+        ),
+    )
+
 
 class ScrapedJobIn(BaseModel):
     url_hash: str
@@ -1,4 +1,5 @@
-from sqlalchemy import Text, Float
+from sqlalchemy import BigInteger, Text, Float, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Column, JSON, String
 from typing import Optional, List
 from enum import Enum
@@ -23,10 +24,22 @@ class TailoredResume(AbstractModel, DefaultTimes, table=True):
     id: int = Field(default=None, primary_key=True)
     
     # Foreign keys
-    analysis_id: int = Field(index=True)  # Links to JobAnalysis
-    original_resume_id: int = Field(index=True)  # Links to UserResume
-    job_id: int = Field(index=True)  # Links to ScrapedJob
-    user_id: int = Field(index=True)
+    analysis_id: int = Field(  # Links to JobAnalysis
+        index=True,
+        sa_column_args=[ForeignKey("job_analysis.id", name="fk_tailored_resume_analysis_id", ondelete="CASCADE")],
+    )
+    original_resume_id: int = Field(  # Links to UserResume
+        index=True,
+        sa_column_args=[ForeignKey("user_resume.id", name="fk_tailored_resume_original_resume_id", ondelete="CASCADE")],
+    )
+    job_id: int = Field(  # Links to ScrapedJob
+        index=True,
+        sa_type=BigInteger,
+        sa_column_args=[ForeignKey("scraped_job.id", name="fk_tailored_resume_job_id", ondelete="CASCADE")],
+    )
+    user_id: int = Field(
+        index=True, sa_column_args=[ForeignKey("user.id", name="fk_tailored_resume_user_id", ondelete="CASCADE")]
+    )
     
     # File storage
     file_path: str = Field(sa_column=Column(String(500)))  # Path to generated file
@@ -36,8 +49,10 @@ class TailoredResume(AbstractModel, DefaultTimes, table=True):
     tailored_content: str = Field(default="", sa_column=Column(Text))  # Markdown/text version
     
     # Optimization tracking
-    optimizations_made: List[str] = Field(default=[], sa_column=Column(JSON))  # List of changes made
-    keywords_added: List[str] = Field(default=[], sa_column=Column(JSON))  # Keywords incorporated
+    # List of changes made
+    optimizations_made: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    # Keywords incorporated
+    keywords_added: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Quality scores
     ats_score: float = Field(default=0, sa_column=Column(Float))  # ATS compatibility score (0-100)
@@ -1,4 +1,5 @@
-from sqlalchemy import Text
+from sqlalchemy import ForeignKey, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Column, JSON, String
 from typing import Optional, List
 from app.model.abstract.model import AbstractModel, DefaultTimes
@@ -13,7 +14,9 @@ class UserResume(AbstractModel, DefaultTimes, table=True):
     File is also stored on disk at file_path for original format preservation.
     """
     id: int = Field(default=None, primary_key=True)
-    user_id: int = Field(index=True)
+    user_id: int = Field(
+        index=True, sa_column_args=[ForeignKey("user.id", name="fk_user_resume_user_id", ondelete="CASCADE")]
+    )
     
     # File storage
     file_path: str = Field(sa_column=Column(String(500)))  # Path to original file
@@ -26,11 +29,13 @@ class UserResume(AbstractModel, DefaultTimes, table=True):
     summary: str = Field(default="", sa_column=Column(Text))
     
     # Structured data as JSON
-    skills: List[str] = Field(default=[], sa_column=Column(JSON))
-    experience: List[dict] = Field(default=[], sa_column=Column(JSON))  # [{title, company, duration, bullets}]
-    education: List[dict] = Field(default=[], sa_column=Column(JSON))  # [{degree, school, year, gpa}]
-    certifications: List[str] = Field(default=[], sa_column=Column(JSON))
-    languages: List[str] = Field(default=[], sa_column=Column(JSON))
+    skills: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    # [{title, company, duration, bullets}]
+    experience: List[dict] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    # [{degree, school, year, gpa}]
+    education: List[dict] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    certifications: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
+    languages: List[str] = Field(default=[], sa_column=Column(JSON().with_variant(JSONB(), "postgresql")))
     
     # Raw text for full-text search and analysis
     raw_text: str = Field(default="", sa_column=Column(Text))
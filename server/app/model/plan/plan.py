@@ -8,7 +8,7 @@ Supports plan resumption after interruption.
 from datetime import datetime
 from enum import IntEnum
 from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, Integer, Text, UniqueConstraint, text
 from sqlalchemy_utils import ChoiceType
 from sqlmodel import Field, JSON, SmallInteger, String
 from pydantic import BaseModel
@@ -46,10 +46,10 @@ class PlanModel(AbstractModel, DefaultTimes, table=True):
     id: int = Field(default=None, primary_key=True)
     
     # References
-    user_id: int = Field(index=True)
+    user_id: int = Field(sa_column_args=[ForeignKey("user.id", name="fk_execution_plan_user_id", ondelete="CASCADE")])
     project_id: str = Field(sa_column=Column(String(64), index=True))
     task_id: str = Field(sa_column=Column(String(64), index=True))
-    plan_id: str = Field(sa_column=Column(String(128), index=True, unique=True))
+    plan_id: str = Field(sa_column=Column(String(128)))
     
     # Plan metadata
     title: str = Field(sa_column=Column(String(512)))
@@ -63,14 +63,19 @@ class PlanModel(AbstractModel, DefaultTimes, table=True):
     steps: List[Dict[str, Any]] = Field(default_factory=list, sa_type=JSON)
     
     # Progress tracking
-    current_step_index: int = Field(default=0)
-    total_steps: int = Field(default=0)
-    completed_steps: int = Field(default=0)
+    current_step_index: int = Field(default=0, sa_type=SmallInteger)
+    total_steps: int = Field(default=0, sa_type=SmallInteger)
+    completed_steps: int = Field(default=0, sa_type=SmallInteger)
     
     # Execution metadata
     started_at: Optional[datetime] = Field(default=None)
     completed_at: Optional[datetime] = Field(default=None)
     error_message: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
+
+    __table_args__ = (
+        UniqueConstraint('plan_id', name='uq_execution_plan_plan_id'),
+        Index('ix_execution_plan_user_id', 'user_id', postgresql_where=text('deleted_at IS NULL')),
+    )
     
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses."""
@@ -136,7 +141,13 @@ class PlanStepModel(AbstractModel, DefaultTimes, table=True):
     id: int = Field(default=None, primary_key=True)
     
     # References
-    plan_id: str = Field(sa_column=Column(String(128), index=True))
+    plan_id: str = Field(
+        sa_column=Column(
+            String(128),
+            ForeignKey("execution_plan.plan_id", name="fk_plan_step_plan_id", ondelete="CASCADE"),
+            index=True,
+        )
+    )
     step_index: int = Field(default=0)
     
     # Step content
@@ -166,12 +177,14 @@ class PlanStepLogModel(AbstractModel, DefaultTimes, table=True):
     """
     __tablename__ = "plan_step_log"
     
-    id: int = Field(default=None, primary_key=True)
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     
     # References
-    plan_id: int = Field(sa_column=Column(Integer, index=True))
-    step_index: int = Field(sa_column=Column(Integer, index=True))
-    log_index: int = Field(default=0)  # Order within step
+    plan_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("execution_plan.id", name="fk_plan_step_log_plan_id", ondelete="CASCADE"))
+    )
+    step_index: int = Field(sa_column=Column(Integer))
+    log_index: int = Field(default=0, sa_type=SmallInteger)  # Order within step
     
     # Log metadata
     toolkit: str = Field(sa_column=Column(String(128)))
@@ -181,6 +194,14 @@ class PlanStepLogModel(AbstractModel, DefaultTimes, table=True):
     
     # Full output (fetched on-demand)
     full_output: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
+
+    __table_args__ = (
+        Index('ix_plan_step_log_plan_step', 'plan_id', 'step_index', postgresql_where=text('deleted_at IS NULL')),
+        Index(
+            'ix_plan_step_log_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32},
+        ),
+    )
     
     def to_dict(self) -> dict:
         """Convert to dictionary for API responses."""
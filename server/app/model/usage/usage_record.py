@@ -10,7 +10,8 @@ This module provides data structures for tracking:
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
-from sqlalchemy import Float, Integer, Column, String, Index
+from sqlalchemy import BigInteger, Float, ForeignKey, Integer, Column, SmallInteger, String, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, JSON
 from pydantic import BaseModel, Field as PydanticField
 from app.model.abstract.model import AbstractModel, DefaultTimes
@@ -28,14 +29,16 @@ class UsageRecord(AbstractModel, DefaultTimes, table=True):
     """
     __tablename__ = "usage_record"
     
-    id: int = Field(default=None, primary_key=True)
-    user_id: int = Field(index=True)
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
+    user_id: int = Field(  # covered by idx_usage_user_created
+        sa_column_args=[ForeignKey("user.id", name="fk_usage_record_user_id", ondelete="RESTRICT")]
+    )
     task_id: str = Field(index=True)
     project_id: Optional[str] = Field(default=None, index=True)
     
     # Agent information
     agent_name: str = Field(sa_column=Column(String(64), index=True))
-    agent_step: Optional[int] = Field(default=None)  # Step number in task execution
+    agent_step: Optional[int] = Field(default=None, sa_type=SmallInteger)  # Step number in task execution
     
     # Model information
     model_platform: str = Field(sa_column=Column(String(64)))
@@ -55,11 +58,17 @@ class UsageRecord(AbstractModel, DefaultTimes, table=True):
     error_message: Optional[str] = Field(default=None, sa_column=Column(String(512)))
     
     # Additional context
-    extra_metadata: Optional[dict] = Field(default=None, sa_column=Column("metadata", JSON))
+    extra_metadata: Optional[dict] = Field(
+        default=None, sa_column=Column("meta", JSON().with_variant(JSONB(), "postgresql"))
+    )
     
     __table_args__ = (
-        Index('idx_usage_user_created', 'user_id', 'created_at'),
-        Index('idx_usage_task_agent', 'task_id', 'agent_name'),
+        Index('idx_usage_user_created', 'user_id', 'created_at', postgresql_where=text('deleted_at IS NULL')),
+        Index('idx_usage_task_agent', 'task_id', 'agent_name', postgresql_where=text('deleted_at IS NULL')),
+        Index(
+            'ix_usage_record_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32},
+        ),
     )
 
 
@@ -4,7 +4,7 @@ User Usage Summary Model
 Tracks monthly token usage and spending for billing purposes.
 """
 from datetime import datetime
-from sqlalchemy import Integer, Float, Boolean, text
+from sqlalchemy import Integer, Float, Boolean, Index, SmallInteger, text
 from sqlmodel import Field, Column
 from app.model.abstract.model import AbstractModel, DefaultTimes
 
@@ -20,8 +20,8 @@ class UserUsageSummary(AbstractModel, DefaultTimes, table=True):
     user_id: int = Field(foreign_key="user.id", index=True, description="User ID")
     
     # Billing period (year-month format for easy querying)
-    billing_year: int = Field(description="Billing year (e.g., 2026)")
-    billing_month: int = Field(description="Billing month (1-12)")
+    billing_year: int = Field(sa_type=SmallInteger, description="Billing year (e.g., 2026)")
+    billing_month: int = Field(sa_type=SmallInteger, description="Billing month (1-12)")
     
     # Token usage tracking
     total_input_tokens: int = Field(
@@ -83,6 +83,15 @@ class UserUsageSummary(AbstractModel, DefaultTimes, table=True):
         default=None,
         description="JSON breakdown of usage by model"
     )
+
+    __table_args__ = (
+        Index(
+            'ix_user_usage_summary_billing_period',
+            'user_id', 'billing_year', 'billing_month',
+            unique=True,
+            postgresql_where=text('deleted_at IS NULL'),
+        ),
+    )
     
     class Config:
         """SQLModel configuration"""
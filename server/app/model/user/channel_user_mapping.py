@@ -56,7 +56,7 @@ class ChannelUserMapping(AbstractModel, DefaultTimes, table=True):
     )
 
     channel_type: str = Field(
-        sa_column=Column(String(32), nullable=False, index=True),
+        sa_column=Column(String(32), nullable=False),
         description=(
             "Channel identifier: telegram, discord, slack, whatsapp, "
             "line, feishu, signal, irc, matrix, msteams, googlechat, etc."
@@ -64,7 +64,7 @@ class ChannelUserMapping(AbstractModel, DefaultTimes, table=True):
     )
 
     channel_user_id: str = Field(
-        sa_column=Column(String(128), nullable=False, index=True),
+        sa_column=Column(String(128), nullable=False),
         description=(
             "Platform-specific user/chat ID. "
             "Telegram: chat_id (stringified BigInt). "
@@ -18,11 +18,12 @@ import logging
 from typing import Any
 
 from pydantic import BaseModel, EmailStr, field_validator
-from sqlalchemy import Float, Integer, JSON, SmallInteger, String, text
+from sqlalchemy import Enum, Float, Index, Integer, JSON, SmallInteger, String, UniqueConstraint, text
 from sqlalchemy_utils import ChoiceType
 from sqlmodel import Column, Field, Session, col, select
 
 from app.component.encrypt import password_hash
+from app.component.stripe_config import SubscriptionPlan
 from app.model.abstract.model import AbstractModel, DefaultTimes
 
 logger = logging.getLogger("user_model")
@@ -34,6 +35,12 @@ class Status(IntEnum):
 
 
 class User(AbstractModel, DefaultTimes, table=True):
+    __table_args__ = (
+        UniqueConstraint("clerk_id", name="uq_user_clerk_id"),
+        UniqueConstraint("stripe_customer_id", name="uq_user_stripe_customer_id"),
+        Index("ux_user_invite_code", "invite_code", unique=True, postgresql_where=text("invite_code IS NOT NULL")),
+    )
+
     id: int = Field(default=None, primary_key=True)
     stack_id: str | None = Field(default=None, unique=True, max_length=255)
     username: str | None = Field(default=None, unique=True, max_length=128)
@@ -48,16 +55,25 @@ class User(AbstractModel, DefaultTimes, table=True):
     last_monthly_credit_date: date | None = Field(default=None, description="Last month monthly credits were granted")
     inviter_user_id: int | None = Field(default=None, foreign_key="user.id", description="Inviter user ID")
     invite_code: str | None = Field(
-        default=None, sa_column=Column(String(32), unique=True, nullable=True),
+        default=None, sa_column=Column(String(32), nullable=True),
         description="Unique referral/invite code for this user",
     )
     status: Status = Field(default=Status.Normal.value, sa_column=Column(ChoiceType(Status, SmallInteger())))
+    # Clerk user ID (added by migration add_clerk_id_to_user)
+    clerk_id: str | None = Field(
+        default=None, sa_column=Column(String(255), nullable=True)
+    )
     # Stripe / subscription fields (added by migration add_stripe_fields_to_user)
     stripe_customer_id: str | None = Field(
-        default=None, sa_column=Column(String(255), unique=True, nullable=True)
+        default=None, sa_column=Column(String(255), nullable=True)
     )
     subscription_plan: str = Field(
-        default="free", sa_column=Column(String(32), server_default=text("'free'"), nullable=False)
+        default="free",
+        sa_column=Column(
+            Enum(*(plan.value for plan in SubscriptionPlan), name="subscription_plan"),
+            server_default=text("'free'"),
+            nullable=False,
+        ),
     )
     stripe_subscription_id: str | None = Field(
         default=None, sa_column=Column(String(255), nullable=True)
@@ -100,7 +116,7 @@ class User(AbstractModel, DefaultTimes, table=True):
         # --- Daily credits ---
         if self.last_daily_credit_date != today:
             try:
-                from app.component.stripe_config import SubscriptionPlan, get_plan_config
+                from app.component.stripe_config import get_plan_config
 
                 plan = SubscriptionPlan(self.subscription_plan or "free")
                 plan_config = get_plan_config(plan)
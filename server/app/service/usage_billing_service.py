@@ -59,6 +59,7 @@ class UsageBillingService:
             UserUsageSummary.user_id == user_id,
             UserUsageSummary.billing_year == year,
             UserUsageSummary.billing_month == month,
+            UserUsageSummary.no_delete(),
         )
         summary = session.exec(statement).first()
         
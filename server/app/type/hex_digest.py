@@ -0,0 +1,35 @@
+# ========= Copyright 2025-2026 @ Hanggent.AI All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2025-2026 @ Hanggent.AI All Rights Reserved. =========
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class HexDigest(TypeDecorator):
+    """
+    Hex digest string stored as raw bytes.
+
+    Application code and the API keep working with hex strings (e.g. an MD5
+    ``hexdigest()``), while the column and its indexes hold the fixed-width
+    binary digest at half the size.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return bytes.fromhex(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return bytes(value).hex() if value is not None else None